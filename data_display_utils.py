@@ -19,15 +19,19 @@ def display_document_details(df, matching_docs):
         years = []
         
         title_rows = df[df['Category'] == 'title']
+        title_values = title_rows.iloc[0].to_dict() if not title_rows.empty else {}
         author_rows = df[df['Category'] == 'authors']
+        author_values = author_rows.iloc[0].to_dict() if not author_rows.empty else {}
         journal_rows = df[df['Category'] == 'journal']
+        journal_values = journal_rows.iloc[0].to_dict() if not journal_rows.empty else {}
         year_rows = df[df['Category'] == 'publication_year']
+        year_values = year_rows.iloc[0].to_dict() if not year_rows.empty else {}
         
         for doc in matching_docs:
-            title = title_rows[doc].iloc[0] if not title_rows.empty else "Unknown"
-            author = author_rows[doc].iloc[0] if not author_rows.empty else "Unknown"
-            journal = journal_rows[doc].iloc[0] if not journal_rows.empty else "Unknown"
-            year = year_rows[doc].iloc[0] if not year_rows.empty else "Unknown"
+            title = title_values.get(doc, "Unknown")
+            author = author_values.get(doc, "Unknown")
+            journal = journal_values.get(doc, "Unknown")
+            year = year_values.get(doc, "Unknown")
             
             titles.append(title if not pd.isna(title) else "Unknown")
             authors.append(author if not pd.isna(author) else "Unknown")
@@ -1,8 +1,31 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import asyncio
+import base64
+import json
+import os
+import pickle
+import re
 import time
+import hashlib
+import html
+import io
+import shelve
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import lru_cache
-from openai import OpenAI
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from insights_prompts import (OVERVIEW_PROMPT, OVERVIEW_CATEGORIES, ADVERSE_EVENTS_PROMPT,
+                              ADVERSE_EVENTS_CATEGORIES, PERCEIVED_BENEFITS_PROMPT, PERCEIVED_BENEFITS_CATEGORIES,
+                              ORAL_HEALTH_PROMPT, ORAL_HEALTH_CATEGORIES, RESPIRATORY_HEALTH_PROMPT,
+                              RESPIRATORY_HEALTH_CATEGORIES, CARDIOVASCULAR_HEALTH_PROMPT,
+                              CARDIOVASCULAR_HEALTH_CATEGORIES, RESEARCH_TRENDS_PROMPT,
+                              RESEARCH_TRENDS_CATEGORIES, CONTRADICTIONS_PROMPT, CONTRADICTIONS_CATEGORIES,
+                              RESEARCH_BIAS_PROMPT, RESEARCH_BIAS_CATEGORIES, PUBLICATION_LEVEL_PROMPT,
+                              PUBLICATION_LEVEL_CATEGORIES)
 
 
 
@@ -10,6 +33,55 @@ from openai import OpenAI
 tab_names = ["Overview", "Adverse Events", "Perceived Benefits", "Health Outcomes", 
              "Research Trends", "Contradictions & Conflicts", "Bias in Research", "Publication Level"]
 
+# The Health Outcomes tab generates insights for three health areas at once
+HEALTH_TAB_INDEX = 3
+INSIGHTS_TOPICS = ["Overall", "Adverse Events", "Perceived Benefits",
+                   "Oral Health", "Respiratory Health", "Cardiovascular Health",
+                   "Research Trends", "Contradictions and Conflicts", "Research Bias", "Publication Metrics"]
+
+def insights_session_key(topic_name):
+    """Session state key holding the generated insights for a topic"""
+    return f"generated_{topic_name.lower().replace(' & ', '_').replace(' ', '_')}_insights"
+
+# Session state keys for the known topics, computed once at import
+TOPIC_KEYS = {topic_name: insights_session_key(topic_name) for topic_name in INSIGHTS_TOPICS}
+
+def find_partial_matches(value_indexes, patterns):
+    """
+    Find the rows whose value contains each pattern, scanning the distinct values of
+    several columns in one pass with a single compiled alternation.
+    Matching follows Series.str.contains semantics (patterns are regular expressions).
+    
+    Args:
+        value_indexes (list): Mappings of column value to row positions, one per column, as built by groupby().indices
+        patterns (list): Patterns to look for in the column values
+    
+    Returns:
+        list: For each column, a dict with the sorted array of matching row positions for every pattern
+    """
+    matches = [{pattern: [] for pattern in patterns} for _ in value_indexes]
+    
+    if patterns:
+        # One alternation pass filters out the values that cannot match any pattern
+        union_pattern = re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+        compiled_patterns = [(pattern, re.compile(pattern)) for pattern in patterns]
+        for column_matches, value_index in zip(matches, value_indexes):
+            for value, rows in value_index.items():
+                if isinstance(value, str) and union_pattern.search(value):
+                    # Only values that matched the union are checked against each pattern
+                    for pattern, compiled_pattern in compiled_patterns:
+                        if compiled_pattern.search(value):
+                            column_matches[pattern].append(rows)
+    
+    return [
+        {
+            pattern: np.sort(np.concatenate(rows)) if rows else np.array([], dtype=np.intp)
+            for pattern, rows in column_matches.items()
+        }
+        for column_matches in matches
+    ]
+
+
 def extract_research_insights_from_docs(df, matching_docs, categories_to_extract):
     """
     Extract comprehensive research insights from matching documents using custom categories.
@@ -25,20 +97,63 @@ def extract_research_insights_from_docs(df, matching_docs, categories_to_extract
         dict: Structured insights data organized by document and category
     """
     insights = {}
-    
+
+    # Build the Category/SubCategory -> row position indexes once instead of
+    # re-filtering the whole DataFrame for every document and subcategory
+    category_index = df.groupby('Category').indices
+    subcategory_index = df.groupby('SubCategory').indices if 'SubCategory' in df.columns else {}
+
+    # Subcategories without an exact Category match fall back to partial matches; resolve
+    # all of them in one pass over the distinct Category and SubCategory values together
+    requested = list(dict.fromkeys(
+        subcategory for subcategories in categories_to_extract.values() for subcategory in subcategories
+    ))
+    category_partial, subcategory_partial = find_partial_matches(
+        [category_index, subcategory_index], [s for s in requested if s not in category_index]
+    )
+
+    # Resolve the rows for every requested subcategory once, shared by all documents
+    subcategory_rows = {}
+    for subcategory in requested:
+        # Look for exact matches first, then partial matches
+        rows = category_index.get(subcategory)
+        if rows is None:
+            rows = category_partial[subcategory]
+
+        # If still not found, look for it in SubCategory
+        if rows.size == 0 and 'SubCategory' in df.columns:
+            rows = subcategory_index.get(subcategory)
+            if rows is None:
+                rows = subcategory_partial[subcategory]
+
+        subcategory_rows[subcategory] = rows
+
+    # Slice each subcategory's rows for all matching documents as one block, with its
+    # missing-value mask, instead of indexing every document column separately
+    doc_values = df[matching_docs].to_numpy()
+    doc_positions = {doc_col: position for position, doc_col in enumerate(matching_docs)}
+    subcategory_blocks = {}
+    for subcategory, rows in subcategory_rows.items():
+        if rows.size:
+            block = doc_values[rows]
+            subcategory_blocks[subcategory] = (block, ~pd.isna(block))
+
+    # Locate the title row once; it is the same row for every document. The Category
+    # index already holds the title rows, so only those are compared on Main Category.
+    title_rows = category_index.get('title', np.array([], dtype=np.intp))
+    meta_title_rows = title_rows[df['Main Category'].to_numpy()[title_rows] == 'meta_data']
+    if meta_title_rows.size:
+        title_rows = meta_title_rows
+    titles = df.iloc[title_rows[0]] if title_rows.size else pd.Series(dtype=object)
+
     # For each matching document, extract the insights
     for doc_col in matching_docs:
         doc_insights = {}
         
+        doc_position = doc_positions[doc_col]
+        
         # Get title if available
-        title = None
-        title_row = df[(df['Main Category'] == 'meta_data') & (df['Category'] == 'title')]
-        if not title_row.empty:
-            title = title_row[doc_col].iloc[0]
-        if title is None:
-            title_row = df[df['Category'] == 'title']
-            if not title_row.empty:
-                title = title_row[doc_col].iloc[0]
+        title = titles.get(doc_col)
         
         doc_identifier = title if title and not pd.isna(title) else doc_col
         
@@ -47,22 +162,9 @@ def extract_research_insights_from_docs(df, matching_docs, categories_to_extract
             category_insights = {}
             
             for subcategory in subcategories:
-                # Look for exact matches first
-                subcategory_rows = df[df['Category'] == subcategory]
-                
-                # If not found, try partial matches
-                if subcategory_rows.empty:
-                    subcategory_rows = df[df['Category'].str.contains(subcategory, na=False)]
-                
-                # If still not found, look for it in SubCategory
-                if subcategory_rows.empty and 'SubCategory' in df.columns:
-                    subcategory_rows = df[df['SubCategory'] == subcategory]
-                    
-                    if subcategory_rows.empty:
-                        subcategory_rows = df[df['SubCategory'].str.contains(subcategory, na=False)]
-                
-                if not subcategory_rows.empty:
-                    subcategory_data = subcategory_rows[doc_col].dropna().tolist()
+                if subcategory in subcategory_blocks:
+                    block, present = subcategory_blocks[subcategory]
+                    subcategory_data = block[present[:, doc_position], doc_position].tolist()
                     # Only include non-empty data
                     if subcategory_data and any(str(item).strip() != "" for item in subcategory_data):
                         category_insights[subcategory] = subcategory_data
@@ -78,15 +180,182 @@ def extract_research_insights_from_docs(df, matching_docs, categories_to_extract
     return insights
 
 
-def generate_insights_with_gpt4o(insights_data, api_key, topic_name="Research", custom_focus_prompt=None):
+@lru_cache(maxsize=1024)
+def readable_subcategory_name(subcategory):
+    """Human-readable version of a subcategory path, e.g. 'findings.main_result' -> 'Findings → Main Result'"""
+    return subcategory.replace('.', ' → ').replace('_', ' ').title()
+
+
+def format_insights_data(insights_data):
+    """
+    Format the structured insights data into the readable text layout used in the prompt.
+    
+    Args:
+        insights_data (dict): Structured insights data organized by document and category
+        
+    Returns:
+        str: Formatted insights text
+    """
+    # Write everything into one buffer instead of building a list of small strings
+    buffer = io.StringIO()
+    
+    for doc_id, doc_data in insights_data.items():
+        buffer.write(f"DOCUMENT: {doc_id}\n")
+        
+        for category, category_data in doc_data.items():
+            # Add category header only if there's actual data
+            if category_data:
+                buffer.write(f"\n{category}:\n")
+                
+                for subcategory, values in category_data.items():
+                    if isinstance(values, list):
+                        # Convert each value to text once
+                        value_strings = [str(v) for v in values if not pd.isna(v)]
+                        
+                        # Skip empty values
+                        if not value_strings or all(v.strip() == "" for v in value_strings):
+                            continue
+                        
+                        readable_subcategory = readable_subcategory_name(subcategory)
+                        
+                        # For lists, prefix each value with its meaning
+                        if len(values) == 1:
+                            buffer.write(f"  - {readable_subcategory}: {value_strings[0]}\n")
+                        else:
+                            buffer.write(f"  - {readable_subcategory}:\n")
+                            for i, val in enumerate(values):
+                                val_string = str(val)
+                                if val_string.strip():  # Only include non-empty values
+                                    buffer.write(f"      * Value {i+1}: {val_string}\n")
+                    else:
+                        # Only include non-empty values
+                        if values and not pd.isna(values) and str(values).strip():
+                            buffer.write(f"  - {readable_subcategory_name(subcategory)}: {values}\n")
+                    
+        buffer.write("\n---\n\n")
+    
+    # Drop the trailing line break after the last document separator
+    return buffer.getvalue()[:-1]
+
+
+def build_insights_request(insights_data, topic_name="Research", custom_focus_prompt=None):
+    """
+    Build the chat completion request asking GPT-4.1 for bullet point insights.
+    
+    Args:
+        insights_data (dict): Structured insights data organized by document and category
+        topic_name (str): The name of the topic for prompt customization
+        custom_focus_prompt (str, optional): Custom prompt section for specific focus areas
+        
+    Returns:
+        dict: Keyword arguments for client.chat.completions.create (also used as a Batch API request body)
+    """
+    # Format the structured insights data into a readable text format for the prompt with improved context
+    formatted_text = format_insights_data(insights_data)
+    
+    # Prepare the prompt with specific formatting instructions
+    prompt = f"""
+    You are an expert researcher analyzing e-cigarette and vaping studies. Below are detailed {topic_name.lower()} insights from several studies, organized by document and category. 
+    
+    Based on these insights, generate 7-10 concise, insightful bullet points that capture the key findings, patterns, and implications across the studies.
+    
+    {custom_focus_prompt}
+    
+    IMPORTANT FORMATTING INSTRUCTION:
+    - Use ONLY a single bullet point character '•' at the beginning of each insight
+    - DO NOT use any secondary or nested bullet points
+    - DO NOT start any line with any other bullet character or symbol
+    
+    Focus on precise measurements, numerical values, and specific technical details that directly enable product improvement.
+
+    Here are the {topic_name.lower()} insights:
+    
+    {formatted_text}
+    
+    Please respond with only the bullet points, each starting with a '•' character.
+    """
+    
+    return {
+        "model": "gpt-4.1",
+        "messages": [
+            {"role": "system", "content": f"You are a helpful assistant that generates concise {topic_name.lower()} insights with simple bullet points. Never use nested bullet points. Always clearly indicate what metrics and units are being used."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.3,
+        "max_tokens": 4096
+    }
+
+
+def add_bullet_line(bullet_parts, line):
+    """
+    Add one line of a model response to the bullet points parsed so far.
+    
+    Args:
+        bullet_parts (list): One list of lines per bullet point, extended in place
+        line (str): Line of the response
+    """
+    line = line.strip()
+    if not line:
+        return
+    if line.startswith('•'):
+        # Remove any potential nested bullets by replacing any bullet characters
+        # that might appear after the initial bullet with their text equivalent
+        if ' • ' in line:
+            line = line.replace(' • ', ': ')  # Replace nested bullets with colons
+        bullet_parts.append([line])
+    elif bullet_parts:  # For lines that might be continuation of previous bullet point
+        # Make sure there are no bullet characters in continuation lines
+        if '•' in line:
+            line = line.replace('•', '')
+        bullet_parts[-1].append(line)
+
+
+def parse_bullet_points(insights_text):
+    """
+    Split a model response into single-level bullet points starting with '•'.
+    
+    Args:
+        insights_text (str): Raw response text
+        
+    Returns:
+        list: Bullet point strings
+    """
+    # Split the text into bullet points, making sure each starts with •.
+    # Each bullet collects its lines in a list that is joined once at the end.
+    bullet_parts = []
+    lines = insights_text.splitlines()
+    for line in lines:
+        add_bullet_line(bullet_parts, line)
+    
+    # If no bullet points were found with •, try to parse by lines
+    if not bullet_parts:
+        return [line.strip().replace('•', '') for line in lines if line.strip()]
+    
+    return [' '.join(parts) for parts in bullet_parts]
+
+
+# lru_cache rather than st.cache_resource, since the client is also requested from worker threads
+@lru_cache(maxsize=8)
+def get_openai_client(api_key):
+    """Return a shared OpenAI client for an API key so its HTTP connection pool is reused across calls"""
+    # Imported here so the app starts without loading the openai package until insights are requested
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+def generate_insights_with_gpt4o(insights_data, api_key, topic_name="Research", custom_focus_prompt=None,
+                                 on_update=None):
     """
     Pass the extracted research insights to GPT-4o and get concise bullet point insights.
     
+    The response is streamed, so the bullet points can be shown while the rest is generated.
+    
     Args:
         insights_data (dict): Structured insights data organized by document and category
         api_key (str): OpenAI API key
         topic_name (str): The name of the topic for prompt customization
         custom_focus_prompt (str, optional): Custom prompt section for specific focus areas
+        on_update (callable, optional): Called with the bullet points received so far whenever a line completes
         
     Returns:
         tuple: (list of generated bullet points with insights, dict with token usage information)
@@ -95,120 +364,610 @@ def generate_insights_with_gpt4o(insights_data, api_key, topic_name="Research",
         return [f"No {topic_name.lower()} insights found in the filtered documents."], {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
     
     try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
+        # Reuse the OpenAI client for this API key
+        client = get_openai_client(api_key)
         
-        # Format the structured insights data into a readable text format for the prompt with improved context
-        formatted_insights = []
+        # Make a streaming API call to GPT-4.1, asking for token usage in the final chunk.
+        # The raw response exposes the rate limit headers before the stream is read.
+        raw_response = client.chat.completions.with_raw_response.create(
+            **build_insights_request(insights_data, topic_name, custom_focus_prompt),
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        update_rate_limit(raw_response.headers)
+        response = raw_response.parse()
         
-        for doc_id, doc_data in insights_data.items():
-            formatted_insights.append(f"DOCUMENT: {doc_id}")
+        # Chunks are joined once at the end. While streaming, only the lines completed by
+        # each chunk are parsed and added to the bullet points shown so far.
+        chunks = []
+        partial_line = ""
+        bullet_parts = []
+        bullets = []
+        usage = None
+        for chunk in response:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
             
-            for category, category_data in doc_data.items():
-                # Add category header only if there's actual data
-                if category_data:
-                    formatted_insights.append(f"\n{category}:")
-                    
-                    for subcategory, values in category_data.items():
-                        # Skip empty values
-                        if not values or all(pd.isna(v) for v in values) or all(str(v).strip() == "" for v in values):
-                            continue
-                            
-                        # Create a human-readable version of the subcategory by replacing dots and underscores
-                        readable_subcategory = subcategory.replace('.', ' → ').replace('_', ' ').title()
-                        
-                        if isinstance(values, list):
-                            # For lists, prefix each value with its meaning
-                            if len(values) == 1:
-                                formatted_insights.append(f"  - {readable_subcategory}: {values[0]}")
-                            else:
-                                formatted_insights.append(f"  - {readable_subcategory}:")
-                                for i, val in enumerate(values):
-                                    if str(val).strip():  # Only include non-empty values
-                                        formatted_insights.append(f"      * Value {i+1}: {val}")
-                        else:
-                            if str(values).strip():  # Only include non-empty values
-                                formatted_insights.append(f"  - {readable_subcategory}: {values}")
-                        
-            formatted_insights.append("\n---\n")
-        
-        # Prepare the prompt with specific formatting instructions
-        prompt = f"""
-        You are an expert researcher analyzing e-cigarette and vaping studies. Below are detailed {topic_name.lower()} insights from several studies, organized by document and category. 
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            chunks.append(delta)
+            if on_update is None:
+                continue
+            
+            partial_line += delta
+            if '\n' not in delta:
+                continue
+            *completed_lines, partial_line = partial_line.split('\n')
+            for line in completed_lines:
+                add_bullet_line(bullet_parts, line)
+                # A line either starts a new bullet point or extends the last one
+                if len(bullets) < len(bullet_parts):
+                    bullets.append(' '.join(bullet_parts[-1]))
+                elif bullet_parts:
+                    bullets[-1] = ' '.join(bullet_parts[-1])
+            
+            # Show the bullet points completed so far
+            if bullets:
+                on_update(list(bullets))
         
-        Based on these insights, generate 7-10 concise, insightful bullet points that capture the key findings, patterns, and implications across the studies.
+        # Extract token usage information
+        token_usage = {
+            "prompt_tokens": usage.prompt_tokens if usage else 0,
+            "completion_tokens": usage.completion_tokens if usage else 0,
+            "total_tokens": usage.total_tokens if usage else 0
+        }
         
-        {custom_focus_prompt}
+        # Extract and process the bullet points
+        return parse_bullet_points(''.join(chunks)), token_usage
+    
+    except Exception as e:
+        return [f"Error generating {topic_name.lower()} insights: {str(e)}"], {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    
+
+@lru_cache(maxsize=64)
+def prompt_digest(custom_focus_prompt):
+    """16-byte digest of a focus prompt, computed once per distinct prompt"""
+    return hashlib.blake2b((custom_focus_prompt or "").encode("utf-8"), digest_size=16).digest()
+
+
+def insights_cache_key(insights_data, topic_name, custom_focus_prompt):
+    """Short content digest identifying an insights request (the API key is not part of it)"""
+    # The data is hashed through pickle, which is much faster than encoding it as JSON
+    digest = hashlib.blake2b(pickle.dumps(insights_data, protocol=5), digest_size=16)
+    digest.update(b"\x00")
+    digest.update(topic_name.encode("utf-8"))
+    digest.update(b"\x00")
+    # The multi-kilobyte focus prompts repeat on every call, so only their digest is fed in
+    digest.update(prompt_digest(custom_focus_prompt))
+    return digest.hexdigest()
+
+
+# Add a cache for API responses, keyed by content digest rather than the full request data.
+# Responses are kept in memory and persisted to disk so they survive app restarts.
+INSIGHTS_CACHE_SIZE = 32
+INSIGHTS_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".insights_cache", "responses")
+INSIGHTS_CACHE_TTL = 7 * 24 * 3600  # One week, in seconds
+INSIGHTS_CACHE_PRUNE_INTERVAL = 50  # Disk writes between scans for expired entries
+_insights_cache = OrderedDict()
+_memory_cache_lock = threading.Lock()
+_disk_cache_lock = threading.Lock()
+_disk_cache_writes = 0
+
+def read_disk_cache(cache_key):
+    """Return the cached (insights, token_usage) pair stored on disk, or None if missing or expired"""
+    try:
+        with _disk_cache_lock, shelve.open(INSIGHTS_CACHE_PATH, flag="r") as disk_cache:
+            entry = disk_cache.get(cache_key)
+    except Exception:
+        # No cache file yet or it cannot be read - behave like a cache miss
+        return None
+    
+    if entry is None:
+        return None
+    saved_at, result = entry
+    if time.time() - saved_at > INSIGHTS_CACHE_TTL:
+        return None
+    return result
+
+
+def prune_disk_cache(disk_cache):
+    """Delete expired and unreadable entries from the open on-disk cache"""
+    now = time.time()
+    for key in list(disk_cache.keys()):
+        try:
+            saved_at, _ = disk_cache[key]
+            is_stale = now - saved_at > INSIGHTS_CACHE_TTL
+        except Exception:
+            # A corrupted entry can never be served, so it is dropped as well
+            is_stale = True
+        if is_stale:
+            try:
+                del disk_cache[key]
+            except Exception:
+                pass
+
+
+def write_disk_cache(cache_key, result):
+    """Persist an (insights, token_usage) pair to the on-disk cache"""
+    global _disk_cache_writes
+    try:
+        os.makedirs(os.path.dirname(INSIGHTS_CACHE_PATH), exist_ok=True)
+        with _disk_cache_lock, shelve.open(INSIGHTS_CACHE_PATH) as disk_cache:
+            disk_cache[cache_key] = (time.time(), result)
+            
+            # Scanning reads every entry, so expired ones are only pruned on the first
+            # write of the process and every INSIGHTS_CACHE_PRUNE_INTERVAL writes after it
+            if _disk_cache_writes % INSIGHTS_CACHE_PRUNE_INTERVAL == 0:
+                try:
+                    prune_disk_cache(disk_cache)
+                except Exception:
+                    pass
+            _disk_cache_writes += 1
+    except Exception:
+        # The disk cache is best effort (e.g. read-only deployments)
+        pass
+
+
+def add_to_memory_cache(cache_key, result):
+    """Keep an (insights, token_usage) pair in the in-memory LRU cache"""
+    with _memory_cache_lock:
+        _insights_cache[cache_key] = result
+        _insights_cache.move_to_end(cache_key)
+        if len(_insights_cache) > INSIGHTS_CACHE_SIZE:
+            _insights_cache.popitem(last=False)
+
+
+def get_cached_insights(cache_key):
+    """Return the cached (insights, token_usage) pair for a request from memory or disk, or None"""
+    with _memory_cache_lock:
+        if cache_key in _insights_cache:
+            _insights_cache.move_to_end(cache_key)
+            return _insights_cache[cache_key]
+    
+    result = read_disk_cache(cache_key)
+    if result is not None:
+        add_to_memory_cache(cache_key, result)
+    return result
+
+
+def store_cached_insights(cache_key, result):
+    """Cache an (insights, token_usage) pair in memory and on disk"""
+    # Only keep responses that actually came back from the API, so errors
+    # (e.g. an invalid API key) are retried on the next call
+    if result[1]["total_tokens"] == 0:
+        return
+    write_disk_cache(cache_key, result)
+    add_to_memory_cache(cache_key, result)
+
+
+# Client-side rate limit for OpenAI calls: a token bucket refilled at API_REQUESTS_PER_SECOND
+# with room for a short burst. Tokens can go negative, so requests that are already
+# reserved (in flight or waiting) push later requests further back.
+API_REQUESTS_PER_SECOND = 1.0
+API_BURST_SIZE = 3
+_rate_limit_lock = threading.Lock()
+_rate_limit_bucket = {"tokens": float(API_BURST_SIZE), "updated": time.monotonic()}
+
+def reserve_api_request(weight=1):
+    """Reserve room for a request in the rate limit bucket and return the seconds to wait before sending it"""
+    with _rate_limit_lock:
+        now = time.monotonic()
+        elapsed = now - _rate_limit_bucket["updated"]
+        tokens = min(API_BURST_SIZE, _rate_limit_bucket["tokens"] + elapsed * API_REQUESTS_PER_SECOND) - weight
+        _rate_limit_bucket["tokens"] = tokens
+        _rate_limit_bucket["updated"] = now
+    return max(0.0, -tokens / API_REQUESTS_PER_SECOND)
+
+
+def parse_reset_duration(duration):
+    """Convert an OpenAI rate limit reset value such as '1s', '6m0s' or '20ms' to seconds"""
+    units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+    return sum(float(amount) * units[unit] for amount, unit in re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', duration))
+
+
+def update_rate_limit(headers):
+    """
+    Hold back further requests when OpenAI reports that the request quota is used up.
+    
+    Args:
+        headers: Response headers carrying x-ratelimit-remaining-requests and x-ratelimit-reset-requests
+    """
+    remaining = headers.get("x-ratelimit-remaining-requests")
+    reset = headers.get("x-ratelimit-reset-requests")
+    if remaining is None or reset is None:
+        return
+    
+    try:
+        remaining = int(remaining)
+    except ValueError:
+        return
+    
+    if remaining > 0:
+        return
+    
+    # Drain the bucket so that the next reserved request waits until the quota resets.
+    # 429 responses are retried by the OpenAI client itself, honouring retry-after.
+    with _rate_limit_lock:
+        now = time.monotonic()
+        elapsed = now - _rate_limit_bucket["updated"]
+        tokens = min(API_BURST_SIZE, _rate_limit_bucket["tokens"] + elapsed * API_REQUESTS_PER_SECOND)
+        _rate_limit_bucket["tokens"] = min(tokens, 1 - parse_reset_duration(reset) * API_REQUESTS_PER_SECOND)
+        _rate_limit_bucket["updated"] = now
+
+
+# Requests currently being generated, keyed by cache key, so identical concurrent
+# requests wait for the same response instead of calling the API again
+_in_flight_requests = {}
+_in_flight_lock = threading.Lock()
+
+def cached_generate_insights(insights_data, api_key, topic_name, custom_focus_prompt, on_update=None,
+                             throttle=False):
+    """Cached version of the generate_insights function to avoid duplicate API calls"""
+    cache_key = insights_cache_key(insights_data, topic_name, custom_focus_prompt)
+    result = get_cached_insights(cache_key)
+    if result is not None:
+        return result
+    
+    # Join an identical request that is already in flight
+    with _in_flight_lock:
+        future = _in_flight_requests.get(cache_key)
+        is_owner = future is None
+        if is_owner:
+            # An identical request may have finished since the cache was checked
+            result = get_cached_insights(cache_key)
+            if result is not None:
+                return result
+            future = Future()
+            _in_flight_requests[cache_key] = future
+    if not is_owner:
+        return future.result()
+    
+    try:
+        # Only requests that reach the API count against the rate limit. This runs in a
+        # worker thread, so waiting here does not hold up the other requests.
+        if throttle:
+            time.sleep(reserve_api_request())
         
-        IMPORTANT FORMATTING INSTRUCTION:
-        - Use ONLY a single bullet point character '•' at the beginning of each insight
-        - DO NOT use any secondary or nested bullet points
-        - DO NOT start any line with any other bullet character or symbol
+        result = generate_insights_with_gpt4o(insights_data, api_key, topic_name, custom_focus_prompt, on_update)
+        store_cached_insights(cache_key, result)
+        future.set_result(result)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight_requests[cache_key]
+    
+    # Return both the insights and token usage
+    return result
+
+
+def generate_insights_concurrently(insights_requests, api_key, update_callbacks=None, throttle=False):
+    """
+    Generate insights for several topics at once, running the API calls concurrently.
+    
+    Args:
+        insights_requests (dict): Maps a result key to an (insights_data, topic_name, custom_focus_prompt) tuple
+        api_key (str): OpenAI API key
+        update_callbacks (dict, optional): Maps a result key to a callback receiving its partial bullet points
+        throttle (bool): Whether the API calls should respect the client-side rate limit
+    
+    Returns:
+        dict: Maps each result key to its (insights, token_usage) tuple
+    """
+    update_callbacks = update_callbacks or {}
+    
+    async def generate(result_key, insights_data, topic_name, custom_focus_prompt):
+        if not insights_data:
+            return [f"No {topic_name.lower()} insights found in the filtered documents."], {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
         
-        Focus on precise measurements, numerical values, and specific technical details that directly enable product improvement.
+        # The blocking client call runs in a worker thread so the requests overlap
+        return await asyncio.to_thread(cached_generate_insights, insights_data, api_key, topic_name,
+                                       custom_focus_prompt, update_callbacks.get(result_key), throttle)
+    
+    async def generate_all():
+        results = await asyncio.gather(*(generate(result_key, *request) for result_key, request in insights_requests.items()))
+        return dict(zip(insights_requests, results))
+    
+    return asyncio.run(generate_all())
+
 
-        Here are the {topic_name.lower()} insights:
+def generate_insights_batch(insights_requests, api_key, poll_interval=10):
+    """
+    Generate insights for several topics with a single OpenAI Batch API submission.
+    
+    Batch requests are billed at half the price of regular requests but can take
+    minutes to complete, so this blocks while polling the batch status.
+    
+    Args:
+        insights_requests (dict): Maps a result key to an (insights_data, topic_name, custom_focus_prompt) tuple
+        api_key (str): OpenAI API key
+        poll_interval (int): Seconds to wait between batch status checks
+    
+    Returns:
+        dict: Maps each result key to its (insights, token_usage) tuple
+    """
+    no_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    results = {}
+    cache_keys = {}
+    batch_lines = []
+    
+    for result_key, (insights_data, topic_name, custom_focus_prompt) in insights_requests.items():
+        if not insights_data:
+            results[result_key] = ([f"No {topic_name.lower()} insights found in the filtered documents."], no_usage)
+            continue
         
-        {'\n'.join(formatted_insights)}
+        # Reuse cached responses and only submit the remaining requests
+        cache_key = insights_cache_key(insights_data, topic_name, custom_focus_prompt)
+        cached_result = get_cached_insights(cache_key)
+        if cached_result is not None:
+            results[result_key] = cached_result
+            continue
         
-        Please respond with only the bullet points, each starting with a '•' character.
-        """
+        cache_keys[result_key] = cache_key
+        batch_lines.append(json.dumps({
+            "custom_id": result_key,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": build_insights_request(insights_data, topic_name, custom_focus_prompt)
+        }))
+    
+    if not batch_lines:
+        return results
+    
+    client = get_openai_client(api_key)
+    
+    # Upload all requests as one JSONL file and submit them as a single batch
+    batch_file = client.files.create(
+        file=("insights_batch.jsonl", "\n".join(batch_lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Insights batch {batch.id} finished with status '{batch.status}'")
+    
+    # Fan the batch output back out to the requests it answers
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
         
-        # Make API call to GPT-4.1
-        response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {"role": "system", "content": f"You are a helpful assistant that generates concise {topic_name.lower()} insights with simple bullet points. Never use nested bullet points. Always clearly indicate what metrics and units are being used."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=4096
-        )
+        output = json.loads(line)
+        result_key = output["custom_id"]
+        response = output.get("response") or {}
+        if response.get("status_code") != 200:
+            error = output.get("error") or response.get("body", {}).get("error") or {}
+            results[result_key] = ([f"Error generating insights: {error.get('message', 'batch request failed')}"], no_usage)
+            continue
         
-        # Extract token usage information
+        body = response["body"]
+        usage = body.get("usage") or {}
         token_usage = {
-            "prompt_tokens": response.usage.prompt_tokens,
-            "completion_tokens": response.usage.completion_tokens,
-            "total_tokens": response.usage.total_tokens
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0)
         }
-        
-        # Extract and process the bullet points
-        insights_text = response.choices[0].message.content
-        
-        # Split the text into bullet points, making sure each starts with •
-        bullet_points = []
-        for line in insights_text.split('\n'):
-            line = line.strip()
-            if line and line.startswith('•'):
-                # Remove any potential nested bullets by replacing any bullet characters
-                # that might appear after the initial bullet with their text equivalent
-                clean_line = line.replace(' • ', ': ')  # Replace nested bullets with colons
-                bullet_points.append(clean_line)
-            elif line and bullet_points:  # For lines that might be continuation of previous bullet point
-                # Make sure there are no bullet characters in continuation lines
-                clean_line = line.replace('•', '')
-                bullet_points[-1] += ' ' + clean_line
-        
-        # If no bullet points were found with •, try to parse by lines
-        if not bullet_points:
-            bullet_points = [line.strip().replace('•', '') for line in insights_text.split('\n') if line.strip()]
-        
-        return bullet_points, token_usage
+        result = (parse_bullet_points(body["choices"][0]["message"]["content"]), token_usage)
+        store_cached_insights(cache_keys[result_key], result)
+        results[result_key] = result
     
-    except Exception as e:
-        return [f"Error generating {topic_name.lower()} insights: {str(e)}"], {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    # Requests missing from the output file failed without a response
+    for result_key in insights_requests:
+        results.setdefault(result_key, (["Error generating insights: no response returned by the batch"], no_usage))
     
+    return results
 
-# Add a cache for API responses
-@lru_cache(maxsize=32)
-def cached_generate_insights(insights_data_str, api_key, topic_name, custom_focus_prompt):
-    """Cached version of the generate_insights function to avoid duplicate API calls"""
-    # Convert insights_data_str back to dictionary
-    import json
-    insights_data = json.loads(insights_data_str)
-    insights, token_usage = generate_insights_with_gpt4o(insights_data, api_key, topic_name, custom_focus_prompt)
-    # Return both the insights and token usage
-    return insights, token_usage
+
+def process_insights_batch(df, matching_docs):
+    """
+    Submit the insights of every tab as one batch and store the results in session state
+    
+    Args:
+        df (pandas.DataFrame): DataFrame containing research data
+        matching_docs (list): List of document columns that match the filters
+    """
+    batch_requests = st.session_state.get("batch_requests", {})
+    
+    if matching_docs:
+        with st.spinner("Waiting for the insights batch to complete..."):
+            try:
+                # Only the selected tab queued its requests, so add the other tabs' requests
+                for tab_index in range(len(tab_names)):
+                    extraction_args = default_extraction_args(tab_index)
+                    if extraction_args[0] not in batch_requests:
+                        batch_requests.update(build_insights_requests(df, matching_docs, *extraction_args))
+                
+                results = generate_insights_batch(batch_requests, st.session_state.openai_api_key)
+                
+                # Save the generated insights and token usage in session state
+                for result_key, (result_insights, result_token_usage) in results.items():
+                    save_generated_insights(result_key, result_insights, result_token_usage)
+            except Exception as e:
+                st.error(f"Error generating insights: {str(e)}")
+    
+    # Every tab is answered by the one batch
+    st.session_state.completed_tabs = set(range(len(tab_names)))
+    st.session_state.progress_status = ["completed"] * len(tab_names)
+    st.session_state.insights_in_progress = False
+    st.session_state.current_processing_tab = -1
+    st.session_state.current_tab_index = -1
+    st.session_state.batch_requests = {}
+    st.rerun()
+
+
+HEALTH_SUBTOPICS = [
+    ("Respiratory Health", RESPIRATORY_HEALTH_PROMPT, RESPIRATORY_HEALTH_CATEGORIES),
+    ("Cardiovascular Health", CARDIOVASCULAR_HEALTH_PROMPT, CARDIOVASCULAR_HEALTH_CATEGORIES)
+]
+
+# Topic, focus prompt and categories of each tab's insights, in tab order. Only the selected
+# tab is rendered, so the other tabs' requests are built from this table
+TAB_INSIGHTS = [
+    ("Overall", OVERVIEW_PROMPT, OVERVIEW_CATEGORIES),
+    ("Adverse Events", ADVERSE_EVENTS_PROMPT, ADVERSE_EVENTS_CATEGORIES),
+    ("Perceived Benefits", PERCEIVED_BENEFITS_PROMPT, PERCEIVED_BENEFITS_CATEGORIES),
+    ("Oral Health", ORAL_HEALTH_PROMPT, ORAL_HEALTH_CATEGORIES),
+    ("Research Trends", RESEARCH_TRENDS_PROMPT, RESEARCH_TRENDS_CATEGORIES),
+    ("Contradictions and Conflicts", CONTRADICTIONS_PROMPT, CONTRADICTIONS_CATEGORIES),
+    ("Research Bias", RESEARCH_BIAS_PROMPT, RESEARCH_BIAS_CATEGORIES),
+    ("Publication Metrics", PUBLICATION_LEVEL_PROMPT, PUBLICATION_LEVEL_CATEGORIES)
+]
+
+
+def default_extraction_args(tab_index):
+    """Arguments for build_insights_requests (after df and matching_docs) for a tab that has not been rendered"""
+    topic_name, custom_focus_prompt, categories_to_extract = TAB_INSIGHTS[tab_index]
+    return (TOPIC_KEYS[topic_name], topic_name, categories_to_extract, custom_focus_prompt,
+            tab_index == HEALTH_TAB_INDEX)
+
+
+def build_insights_requests(df, matching_docs, insights_key, topic_name="Research",
+                            categories_to_extract=None, custom_focus_prompt=None, is_health_tab=False):
+    """
+    Extract the research data for a tab and collect the insights requests it needs.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame containing research data
+        matching_docs (list): List of document columns that match the filters
+        insights_key (str): Session state key for the tab's insights
+        topic_name (str): Name of the research topic
+        categories_to_extract (dict): Categories and subcategories to extract
+        custom_focus_prompt (str): Custom prompt for the tab
+        is_health_tab (bool): Whether the respiratory and cardiovascular insights should be added
+    
+    Returns:
+        dict: Maps a session state key to an (insights_data, topic_name, custom_focus_prompt) tuple
+    """
+    # Extract research insights from matching documents
+    research_insights = extract_research_insights_from_docs(df, matching_docs, categories_to_extract)
+    
+    # Insights to generate, keyed by their session state key
+    insights_requests = {insights_key: (research_insights, topic_name, custom_focus_prompt)}
+    
+    # For health tab, we need to generate insights for all three health areas at once
+    if is_health_tab and "Oral Health" in topic_name:
+        for subtopic_name, subtopic_prompt, subtopic_categories in HEALTH_SUBTOPICS:
+            insights_requests[TOPIC_KEYS[subtopic_name]] = (
+                extract_research_insights_from_docs(df, matching_docs, subtopic_categories),
+                subtopic_name, subtopic_prompt)
+    
+    return insights_requests
+
+
+# Extractions for upcoming tabs run in the background, overlapping the current tab's API calls
+_extraction_executor = ThreadPoolExecutor(max_workers=4)
+
+def prefetch_insights_requests(df, matching_docs, tab_index):
+    """
+    Start building a tab's insights requests in a background thread.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame containing research data
+        matching_docs (list): List of document columns that match the filters
+        tab_index (int): Index of the tab to prefetch
+    """
+    extraction_args = st.session_state.get("tab_extraction_args", {}).get(tab_index)
+    if extraction_args is None:
+        extraction_args = default_extraction_args(tab_index)
+    
+    future = _extraction_executor.submit(build_insights_requests, df, matching_docs, *extraction_args)
+    st.session_state.setdefault("prefetched_insights_requests", {})[tab_index] = (
+        tuple(matching_docs), extraction_args, future)
+
+
+def take_prefetched_insights_requests(matching_docs, tab_index, extraction_args):
+    """
+    Return the insights requests prefetched for a tab, or None if there are none for these arguments.
+    
+    Args:
+        matching_docs (list): List of document columns that match the filters
+        tab_index (int): Index of the tab
+        extraction_args (tuple): Arguments the tab passes to build_insights_requests after df and matching_docs
+    
+    Returns:
+        dict: The prefetched insights requests, or None
+    """
+    prefetched = st.session_state.get("prefetched_insights_requests", {}).pop(tab_index, None)
+    if prefetched is None:
+        return None
+    
+    prefetched_docs, prefetched_args, future = prefetched
+    if prefetched_docs != tuple(matching_docs) or prefetched_args != extraction_args:
+        # The filters or the tab changed since the prefetch started
+        future.cancel()
+        return None
+    return future.result()
+
+
+def insights_box_html(insights, height=525, token_usage=None):
+    """
+    Build the scrollable HTML box that shows a tab's insights.
+    
+    Args:
+        insights (list): Bullet point strings
+        height (int): Height of the box in pixels
+        token_usage (dict, optional): Token usage shown at the bottom of the box
+    
+    Returns:
+        str: HTML for st.markdown
+    """
+    # Escape the model output so it cannot inject markup into the page
+    body = "".join(f"<p>{html.escape(insight)}</p>" for insight in insights)
+    
+    # Add token usage information at the bottom if available
+    token_html = ""
+    if token_usage is not None:
+        token_limit = 1000000  # GPT-4.1 token limit
+        token_percentage = (token_usage["total_tokens"] / token_limit) * 100
+        token_html = f"<p style='font-size: 0.8em; color: #666; border-top: 1px solid #ddd; padding-top: 5px;'>Tokens used: {token_usage['total_tokens']} ({token_percentage:.1f}% of 1 million token limit)</p>"
+    
+    return f'<div style="height: {height}px; overflow-y: auto; padding: 0.5rem; border: 2px solid #f8d6d5; border-radius: 0.5rem;">{body}{token_html}</div>'
+
+
+@st.cache_resource
+def wordcloud_data_uri(wordcloud_path):
+    """Read the wordcloud PNG once and return it as a base64 data URI for inline HTML"""
+    with open(wordcloud_path, "rb") as image_file:
+        return "data:image/png;base64," + base64.b64encode(image_file.read()).decode('utf-8')
+
+
+def save_generated_insights(insights_key, insights, token_usage):
+    """Store a topic's insights and token usage in session state, dropping its cached HTML"""
+    st.session_state[insights_key] = insights
+    st.session_state[f"{insights_key}_token_usage"] = token_usage
+    st.session_state.pop(f"{insights_key}_html", None)
+
+
+def cached_insights_html(insights_key, height=525):
+    """
+    Return the insights box HTML for a topic in session state, rendering it only when the insights change.
+    
+    Args:
+        insights_key (str): Session state key of the topic's insights
+        height (int): Height of the box in pixels
+    
+    Returns:
+        str: HTML for st.markdown
+    """
+    html_key = f"{insights_key}_html"
+    cached_html = st.session_state.get(html_key)
+    if cached_html is None or cached_html[0] != height:
+        insights_html = insights_box_html(st.session_state[insights_key], height,
+                                          st.session_state.get(f"{insights_key}_token_usage"))
+        cached_html = (height, insights_html)
+        st.session_state[html_key] = cached_html
+    return cached_html[1]
 
 
 def display_insights(df, matching_docs, section_title="Research Insights", 
@@ -235,175 +994,69 @@ def display_insights(df, matching_docs, section_title="Research Insights",
     
     with insights_container:
         # Key for storing insights in session state - add support for subtopics
-        insights_key = f"generated_{topic_name.lower().replace(' & ', '_').replace(' ', '_')}_insights"
-        token_usage_key = f"{insights_key}_token_usage"
+        insights_key = TOPIC_KEYS.get(topic_name) or insights_session_key(topic_name)
         
         # For health outcomes tab, use special handling for subtopics
-        is_health_tab = (tab_index == 3)
+        is_health_tab = (tab_index == HEALTH_TAB_INDEX)
+        
+        # Remember how this tab extracts its data, so the extraction can be started in the
+        # background while the previous tab waits on the API
+        extraction_args = (insights_key, topic_name, categories_to_extract, custom_focus_prompt, is_health_tab)
+        if tab_index >= 0:
+            st.session_state.setdefault("tab_extraction_args", {})[tab_index] = extraction_args
+        
+        # In batch mode every tab queues its requests for a single submission
+        is_batch_tab = (st.session_state.insights_in_progress and
+                        st.session_state.get("insights_batch_mode", False) and
+                        tab_index >= 0 and tab_index not in st.session_state.completed_tabs)
         
         # Check if this tab should be processed
         is_current_tab = (st.session_state.insights_in_progress and 
+                          not st.session_state.get("insights_batch_mode", False) and
                           tab_index == st.session_state.current_processing_tab and
                           tab_index not in st.session_state.completed_tabs)
         
-        if is_current_tab:
+        if is_batch_tab:
+            try:
+                batch_requests = build_insights_requests(df, matching_docs, *extraction_args)
+                st.session_state.batch_requests.update(batch_requests)
+                st.info(f"{topic_name} insights are queued for the batch submission.")
+            except Exception as e:
+                st.error(f"Error preparing insights: {str(e)}")
+            
+        elif is_current_tab:
             with st.spinner(f"Generating {topic_name.lower()} insights..."):
                 try:
-                    # Extract research insights from matching documents
-                    research_insights = extract_research_insights_from_docs(df, matching_docs, categories_to_extract)
+                    # Extract research data and collect the insights requests for this tab,
+                    # using the extraction started while the previous tab was generating if there is one
+                    insights_requests = take_prefetched_insights_requests(matching_docs, tab_index, extraction_args)
+                    if insights_requests is None:
+                        insights_requests = build_insights_requests(df, matching_docs, *extraction_args)
                     
-                    if not research_insights:
-                        insights = [f"No {topic_name.lower()} insights found in the filtered documents."]
-                        token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-                    else:
-                        # Apply throttling if enabled
-                        if enable_throttling and 'last_api_call' in st.session_state:
-                            time_since_last_call = time.time() - st.session_state.last_api_call
-                            if time_since_last_call < 1.0:  # Limit to 1 request per second
-                                wait_time = 1.0 - time_since_last_call
-                                time.sleep(wait_time)
-                        
-                        # Use the cached version to avoid duplicate API calls
-                        import json
-                        insights_data_str = json.dumps(research_insights)
-                        insights, token_usage = cached_generate_insights(insights_data_str, api_key, topic_name, custom_focus_prompt)
-                        
-                        # Update the last API call timestamp
-                        st.session_state.last_api_call = time.time()
+                    # Extract the next tab's data in the background while this tab waits on the API
+                    if tab_index < len(tab_names) - 1:
+                        prefetch_insights_requests(df, matching_docs, tab_index + 1)
                     
-                    # Save the generated insights and token usage in session state
-                    st.session_state[insights_key] = insights
-                    st.session_state[token_usage_key] = token_usage
+                    # Stream this tab's bullet points into a placeholder as they arrive.
+                    # The callback runs in a worker thread, so it is attached to this script run.
+                    insights_placeholder = st.empty()
+                    script_run_ctx = get_script_run_ctx()
                     
-                    # For health tab, we need to generate insights for all three health areas at once
-                    if is_health_tab:
-                        # Store insights for current subtopic area
-                        if "Oral Health" in topic_name:
-                            st.session_state["generated_oral_health_insights"] = insights
-                            st.session_state["generated_oral_health_insights_token_usage"] = token_usage
-                            
-                            # Now generate insights for respiratory health
-                            respiratory_prompt = """As an R&D specialist analyzing e-cigarette research on respiratory health, focus exclusively on specific product parameters and ingredients that impact respiratory health outcomes.
-                                Avoid general statements about respiratory health and instead extract precise technical information that can directly improve product safety profiles.
-                                
-                                Emphasize:
-                                1. Specific aerosol particle sizes from different device types and their measured deposition patterns
-                                2. Exact chemical compounds at specific concentrations linked to respiratory irritation
-                                3. Precise temperature/power settings associated with reduced respiratory effects (with numerical values)
-                                4. Particular e-liquid formulations showing improved respiratory safety profiles (with measured data)
-                                5. Specific device design elements that demonstrably filter or reduce harmful respiratory exposures
-                                6. Comparative respiratory biomarker data between specific product designs (with exact measurements)
-                                
-                                Include specific quantitative data on aerosol physics, chemical composition, and physiological responses whenever available."""
-                            
-                            # Define categories specific to respiratory health
-                            respiratory_categories = {
-                                "Health Outcomes": [
-                                    "respiratory_effects.measured_outcomes",
-                                    "respiratory_effects.findings.description",
-                                    "respiratory_effects.findings.comparative_results",
-                                    "respiratory_effects.specific_conditions.asthma",
-                                    "respiratory_effects.specific_conditions.copd",
-                                    "respiratory_effects.specific_conditions.wheezing",
-                                    "respiratory_effects.specific_conditions.other_conditions",
-                                    "respiratory_effects.biomarkers",
-                                    "respiratory_effects.lung_function_tests.tests_performed",
-                                    "respiratory_effects.lung_function_tests.results"
-                                ],
-                                "Self-Reported Effects": [
-                                    "adverse_events.respiratory_events.breathing_difficulties.overall_percentage",
-                                    "adverse_events.respiratory_events.breathing_difficulties.group_percentages",
-                                    "adverse_events.respiratory_events.chest_pain.overall_percentage",
-                                    "adverse_events.respiratory_events.chest_pain.group_percentages",
-                                    "adverse_events.respiratory_events.other_respiratory_events",
-                                    "adverse_events.oral_events.cough.overall_percentage",
-                                    "adverse_events.oral_events.cough.time_course"
-                                ],
-                                "Causal Mechanisms": [
-                                    "chemicals_implicated.name",
-                                    "chemicals_implicated.effects",
-                                    "biological_pathways.pathway",
-                                    "biological_pathways.description"
-                                ],
-                                "Key Findings": [
-                                    "main_conclusions", 
-                                    "novel_findings"
-                                ]
-                            }
-                            
-                            respiratory_insights = extract_research_insights_from_docs(df, matching_docs, respiratory_categories)
-                            if respiratory_insights:
-                                respiratory_data_str = json.dumps(respiratory_insights)
-                                respiratory_results, respiratory_token_usage = cached_generate_insights(respiratory_data_str, api_key, "Respiratory Health", respiratory_prompt)
-                                st.session_state["generated_respiratory_health_insights"] = respiratory_results
-                                st.session_state["generated_respiratory_health_insights_token_usage"] = respiratory_token_usage
-                            else:
-                                st.session_state["generated_respiratory_health_insights"] = ["No respiratory health insights found in the filtered documents."]
-                                st.session_state["generated_respiratory_health_insights_token_usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-                            
-                            # Now generate insights for cardiovascular health
-                            cardiovascular_prompt = """As an R&D specialist analyzing e-cigarette research on cardiovascular health, focus exclusively on specific product parameters and ingredients that impact cardiovascular health metrics.
-                                Avoid general statements about cardiovascular risks and instead extract precise technical information that can directly inform product design and formulation.
-                                
-                                Emphasize:
-                                1. Specific nicotine delivery patterns and their measured effects on heart rate/blood pressure (with exact values)
-                                2. Exact chemical constituents linked to vascular effects with their concentrations
-                                3. Precise operating parameters associated with minimized cardiovascular impact (with numerical data)
-                                4. Particular device design elements showing improved cardiovascular safety profiles
-                                5. Specific e-liquid formulations with measured reduced impact on endothelial function
-                                6. Comparative cardiac biomarker data between specific product types (with exact measurements)
-                                
-                                Include exact measurements, concentration ranges, and physiological response data whenever available."""
-                            
-                            # Categories specific to cardiovascular health
-                            cardiovascular_categories = {
-                                "Health Outcomes": [
-                                    "cardiovascular_effects.measured_outcomes",
-                                    "cardiovascular_effects.findings.description",
-                                    "cardiovascular_effects.findings.comparative_results",
-                                    "cardiovascular_effects.blood_pressure",
-                                    "cardiovascular_effects.heart_rate",
-                                    "cardiovascular_effects.biomarkers"
-                                ],
-                                "Self-Reported Effects": [
-                                    "adverse_events.cardiovascular_events.heart_palpitation.overall_percentage",
-                                    "adverse_events.cardiovascular_events.heart_palpitation.group_percentages",
-                                    "adverse_events.cardiovascular_events.other_cardiovascular_events"
-                                ],
-                                "Causal Mechanisms": [
-                                    "chemicals_implicated.name",
-                                    "chemicals_implicated.effects",
-                                    "biological_pathways.pathway",
-                                    "biological_pathways.description"
-                                ],
-                                "Key Findings": [
-                                    "main_conclusions", 
-                                    "novel_findings"
-                                ]
-                            }
-                            
-                            cardiovascular_insights = extract_research_insights_from_docs(df, matching_docs, cardiovascular_categories)
-                            if cardiovascular_insights:
-                                cardiovascular_data_str = json.dumps(cardiovascular_insights)
-                                cardiovascular_results, cardiovascular_token_usage = cached_generate_insights(cardiovascular_data_str, api_key, "Cardiovascular Health", cardiovascular_prompt)
-                                st.session_state["generated_cardiovascular_health_insights"] = cardiovascular_results
-                                st.session_state["generated_cardiovascular_health_insights_token_usage"] = cardiovascular_token_usage
-                            else:
-                                st.session_state["generated_cardiovascular_health_insights"] = ["No cardiovascular health insights found in the filtered documents."]
-                                st.session_state["generated_cardiovascular_health_insights_token_usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+                    def show_partial_insights(partial_insights):
+                        add_script_run_ctx(threading.current_thread(), script_run_ctx)
+                        insights_placeholder.markdown(insights_box_html(partial_insights, height), unsafe_allow_html=True)
                     
-                    # Display the insights we just generated with direct height styling
-                    insights_html = f'<div style="height: {height}px; overflow-y: auto; padding: 0.5rem; border: 2px solid #f8d6d5; border-radius: 0.5rem;">'
-                    for insight in insights:
-                        insights_html += f"<p>{insight}</p>"
+                    # Run the API calls for all requested topics concurrently, throttled if enabled
+                    results = generate_insights_concurrently(insights_requests, api_key,
+                                                             {insights_key: show_partial_insights},
+                                                             throttle=enable_throttling)
                     
-                    # Add token usage information at the bottom
-                    token_limit = 1000000  # GPT-4.1 token limit
-                    token_percentage = (token_usage["total_tokens"] / token_limit) * 100
-                    insights_html += f"<p style='font-size: 0.8em; color: #666; border-top: 1px solid #ddd; padding-top: 5px;'>Tokens used: {token_usage['total_tokens']} ({token_percentage:.1f}% of 1 million token limit)</p>"
+                    # Save the generated insights and token usage in session state
+                    for result_key, (result_insights, result_token_usage) in results.items():
+                        save_generated_insights(result_key, result_insights, result_token_usage)
                     
-                    insights_html += "</div>"
-                    st.markdown(insights_html, unsafe_allow_html=True)
+                    # Replace the streamed bullet points with the complete insights
+                    insights_placeholder.markdown(cached_insights_html(insights_key, height), unsafe_allow_html=True)
                     
                     # Mark this tab as completed
                     st.session_state.completed_tabs.add(tab_index)
@@ -420,8 +1073,6 @@ def display_insights(df, matching_docs, section_title="Research Insights",
                         st.session_state.current_tab_index = -1
                     
                     # Force a rerun to update UI and move to next tab
-                    # Use a sleep to ensure the UI updates properly
-                    time.sleep(0.5)
                     st.rerun()
                     
                 except Exception as e:
@@ -433,24 +1084,11 @@ def display_insights(df, matching_docs, section_title="Research Insights",
                     else:
                         st.session_state.insights_in_progress = False
                         st.session_state.current_processing_tab = -1
-                    time.sleep(0.5)
                     st.rerun()
                     
         elif insights_key in st.session_state:
             # Display previously generated insights with direct height styling
-            insights_html = f'<div style="height: {height}px; overflow-y: auto; padding: 0.5rem; border: 2px solid #f8d6d5; border-radius: 0.5rem;">'
-            for insight in st.session_state[insights_key]:
-                insights_html += f"<p>{insight}</p>"
-            
-            # Add token usage information at the bottom if available
-            if token_usage_key in st.session_state:
-                token_usage = st.session_state[token_usage_key]
-                token_limit = 1000000  # GPT-4.1 token limit
-                token_percentage = (token_usage["total_tokens"] / token_limit) * 100
-                insights_html += f"<p style='font-size: 0.8em; color: #666; border-top: 1px solid #ddd; padding-top: 5px;'>Tokens used: {token_usage['total_tokens']} ({token_percentage:.1f}% of 1 million token limit)</p>"
-            
-            insights_html += "</div>"
-            st.markdown(insights_html, unsafe_allow_html=True)
+            st.markdown(cached_insights_html(insights_key, height), unsafe_allow_html=True)
             
         else:
             # Empty state with wordcloud and direct height styling
@@ -459,18 +1097,16 @@ def display_insights(df, matching_docs, section_title="Research Insights",
                 message = "Please enter your OpenAI API key to generate insights."
             
             try:
-                # Load the wordcloud image
-                import base64
-                with open(wordcloud_path, "rb") as image_file:
-                    encoded_image = base64.b64encode(image_file.read()).decode('utf-8')
+                # Load the wordcloud image (encoded once and shared by all tabs and reruns)
+                wordcloud_uri = wordcloud_data_uri(wordcloud_path)
                 
-                html = f"""
+                empty_state_html = f"""
                 <div style="height: {height}px; overflow-y: auto; padding: 0.5rem; border: 2px solid #f8d6d5; border-radius: 0.5rem; display: flex; flex-direction: column; align-items: center; justify-content: center;">
                     <p style="color: #666; text-align: left; margin-bottom: 0px; position: absolute; top: 8px; left: 20px; right: 0; z-index: 2;">{message}</p>
-                    <img src="data:image/png;base64,{encoded_image}" style="width: 100%; height: 100%; object-fit: cover; padding: 35px 0px 15px 0px;" />
+                    <img src="{wordcloud_uri}" style="width: 100%; height: 100%; object-fit: cover; padding: 35px 0px 15px 0px;" />
                 </div>
                 """
-                st.markdown(html, unsafe_allow_html=True)
+                st.markdown(empty_state_html, unsafe_allow_html=True)
             except Exception as e:
                 st.markdown(f"""
                 <div style="height: {height}px; overflow-y: auto; padding: 0.5rem; border: 2px solid #f8d6d5; border-radius: 0.5rem; display: flex; flex-direction: column; align-items: center; justify-content: center;">
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from openai import OpenAI
 import re
 
 def generate_comprehensive_paper_insights(df, doc, title, api_key):
@@ -201,7 +200,8 @@ def generate_comprehensive_paper_insights(df, doc, title, api_key):
         return ["No insights found for this paper."]
     
     try:
-        # Initialize OpenAI client
+        # Initialize OpenAI client, importing the package only once insights are requested
+        from openai import OpenAI
         client = OpenAI(api_key=api_key)
         
         # Format the structured insights data with improved context preservation
@@ -1,15 +1,27 @@
+import os
+import base64
+import gzip
+import time
 import streamlit as st
 import pandas as pd
+import numpy as np
 from PIL import Image
 import requests
 
-from insights_utils import display_insights
+from insights_utils import display_insights, process_insights_batch, TOPIC_KEYS
+from insights_prompts import (OVERVIEW_PROMPT, OVERVIEW_CATEGORIES, ADVERSE_EVENTS_PROMPT, ADVERSE_EVENTS_CATEGORIES,
+                             PERCEIVED_BENEFITS_PROMPT, PERCEIVED_BENEFITS_CATEGORIES, ORAL_HEALTH_PROMPT, ORAL_HEALTH_CATEGORIES,
+                             RESPIRATORY_HEALTH_PROMPT, RESPIRATORY_HEALTH_CATEGORIES,
+                             CARDIOVASCULAR_HEALTH_PROMPT, CARDIOVASCULAR_HEALTH_CATEGORIES,
+                             RESEARCH_TRENDS_PROMPT, RESEARCH_TRENDS_CATEGORIES, CONTRADICTIONS_PROMPT, CONTRADICTIONS_CATEGORIES,
+                             RESEARCH_BIAS_PROMPT, RESEARCH_BIAS_CATEGORIES, PUBLICATION_LEVEL_PROMPT, PUBLICATION_LEVEL_CATEGORIES)
 from visualization_utils import display_publication_distribution
 from visualization_utils import render_harmful_ingredients_visualization, render_perceived_benefits_visualization
 from visualization_utils import render_research_trends_visualization, render_contradictions_visualization
 from visualization_utils import render_bias_visualization, render_publication_level_visualization
 from visualization_utils import display_sankey_dropdown, display_main_category_sankey
 from trending_research import display_trending_research
+from data_display_utils import display_document_details, display_raw_data
 
 # Page config
 st.set_page_config(
@@ -23,11 +35,183 @@ st.set_page_config(
 tab_names = ["Overview", "Adverse Events", "Perceived Benefits", "Health Outcomes", 
              "Research Trends", "Contradictions & Conflicts", "Bias in Research", "Publication Level"]                
                 
-# Load the Excel file
+# Sidebar button styles
+SIDEBAR_BUTTON_CSS = """
+    <style>
+    /* Style for regular buttons - including all states */
+    div.stButton > button:first-child {
+        background-color: #5aac90;
+        color: white;
+        border: 2px solid transparent;  /* Start with transparent border */
+    }
+    
+    div.stButton > button:hover {
+        background-color: #5aac90;
+        color: white;
+        border: 2px solid orange;  /* Thicker red border on hover */
+        box-sizing: border-box;  /* Ensure border doesn't change button size */
+    }
+    
+    div.stButton > button:active, div.stButton > button:focus {
+        background-color: #5aac90;
+        color: yellow !important;
+        border: 2px solid orange !important;  /* Thicker red border on active/focus */
+        box-shadow: none;
+    }
+    
+    /* Style for download buttons - including all states */
+    div.stDownloadButton > button:first-child {
+        background-color: #5aac90;
+        color: white;
+        border: 1px solid transparent;  /* Start with transparent border */
+    }
+    
+    div.stDownloadButton > button:hover {
+        background-color: #5aac90;
+        color: white;
+        border: 3px solid red;  /* Thicker red border on hover */
+        box-sizing: border-box;  /* Ensure border doesn't change button size */
+    }
+    
+    div.stDownloadButton > button:active, div.stDownloadButton > button:focus {
+        background-color: #5aac90;
+        color: white !important;
+        border: 3px solid red !important;  /* Thicker red border on active/focus */
+        box-shadow: none;
+    }
+    </style>
+    """
+
+# Styles for the segmented progress bar
+PROGRESS_BAR_CSS = """
+    <style>
+    .progress-container {
+        margin-top: 20px;
+        margin-bottom: 20px;
+    }
+    .progress-header {
+        font-size: 0.9rem;
+        font-weight: bold;
+        margin-bottom: 10px;
+    }
+    .segments-container {
+        display: flex;
+        height: 12px;
+        width: 100%;
+        border-radius: 8px;
+        overflow: hidden;
+    }
+    .segment {
+        flex: 1;
+        height: 100%;
+        margin: 0 1px;
+    }
+    .not-started {
+        background-color: #ffebeb;  /* light pink for not started */
+    }
+    .waiting {
+        background-color: #ffcccb;  /* Light red for waiting */
+    }
+    .processing {
+        background-color: #FF7417;  /* Orange for processing (Imperial Brands color) */
+        animation: pulse 1.5s infinite;
+    }
+    .completed {
+        background-color: #5aac90;  /* Green for completed */
+    }
+    .segment-labels {
+        display: flex;
+        justify-content: space-between;
+        margin-top: 5px;
+        font-size: 0.7rem;
+    }
+    .segment-label {
+        flex: 1;
+        text-align: center;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+        padding: 0 1px;
+    }
+    @keyframes pulse {
+        0% { opacity: 0.5; }
+        50% { opacity: 1; }
+        100% { opacity: 0.5; }
+    }
+    </style>
+    """
+
+# Tab selector styles: the horizontal radio is drawn as a row of tabs
+TAB_SELECTOR_CSS = """
+    <style>
+    .st-key-active_tab div[role="radiogroup"] {
+        gap: 0;
+        border-bottom: 1px solid rgba(49, 51, 63, 0.2);
+    }
+    .st-key-active_tab label[data-baseweb="radio"] {
+        margin: 0;
+        padding: 0.5rem 1rem;
+        border-bottom: 2px solid transparent;
+    }
+    .st-key-active_tab label[data-baseweb="radio"] > div:first-child {
+        display: none;  /* Hide the radio circle */
+    }
+    .st-key-active_tab label[data-baseweb="radio"]:has(input:checked) {
+        color: #ff4b4b;
+        border-bottom-color: #ff4b4b;
+    }
+    </style>
+    """
+
+# Health Outcomes tab styles for the anatomy diagram
+HEALTH_TAB_CSS = """
+        <style>
+        /* Make the anatomy diagram larger */
+        .anatomy-diagram {
+            width: 100%;
+            height: 450px;
+        }
+        
+        /* Highlight boxes for different health sections */
+        .highlight-box {
+            border: 2px solid transparent;
+            border-radius: 6px;
+            padding: 4px;
+            margin-bottom: 10px;
+            transition: all 0.3s;
+        }
+        </style>
+        """
+
+# Outline for the button of the selected health area, applied through the button's st-key class
+ACTIVE_HEALTH_BUTTON_CSS = """
+        <style>
+        .st-key-{button_key} button {{
+            border: 2px solid orange;
+        }}
+        </style>
+        """
+HEALTH_AREA_BUTTON_KEYS = {"oral": "oral_health_btn", "lung": "respiratory_health_btn", "heart": "cardiovascular_health_btn"}
+
+DATA_PATH = 'E_Cigarette_Research_Metadata_Consolidated.xlsx'
+# Pickle rather than parquet/feather: the document columns mix ints and strings, which Arrow refuses to store
+DATA_CACHE_PATH = os.path.join('.data_cache', 'E_Cigarette_Research_Metadata_Consolidated.pkl')
+
+# Load the Excel file, reusing the parsed copy on disk while it is newer than the workbook
 @st.cache_data
 def load_data():
     try:
-        df = pd.read_excel('E_Cigarette_Research_Metadata_Consolidated.xlsx')
+        if os.path.exists(DATA_CACHE_PATH) and os.path.getmtime(DATA_CACHE_PATH) >= os.path.getmtime(DATA_PATH):
+            try:
+                return pd.read_pickle(DATA_CACHE_PATH)
+            except Exception:
+                pass
+        df = pd.read_excel(DATA_PATH)
+        try:
+            os.makedirs(os.path.dirname(DATA_CACHE_PATH), exist_ok=True)
+            df.to_pickle(DATA_CACHE_PATH)
+        except Exception:
+            pass
         return df
     except Exception as e:
         st.error(f"Error loading data: {e}")
@@ -35,193 +219,162 @@ def load_data():
 
 df = load_data()
 
-# Extract years from the dataframe - find rows where Category is 'publication_year'
-def get_publication_years():
-    if 'Category' in df.columns and 'publication_year' in df['Category'].values:
-        # Get all rows where Category is 'publication_year'
-        year_rows = df[df['Category'] == 'publication_year']
-        # Extract years from all document columns (starting from column index 3)
-        years = []
-        doc_columns = df.columns[3:]
-        for doc_col in doc_columns:
-            year_values = year_rows[doc_col].dropna().astype(str)
-            for year in year_values:
-                try:
-                    years.append(int(float(year)))
-                except (ValueError, TypeError):
-                    continue
-        return years
-    return [2011, 2025]  # Default range if data not found
-
-# Get sample sizes
-def get_sample_sizes():
-    if 'Category' in df.columns and 'SubCategory' in df.columns:
-        # Get all rows where SubCategory is 'total_size'
-        size_rows = df[(df['SubCategory'] == 'total_size')]
-        # Extract sizes from all document columns
-        sizes = []
-        doc_columns = df.columns[3:]
-        for doc_col in doc_columns:
-            size_values = size_rows[doc_col].dropna().astype(str)
-            for size in size_values:
-                try:
-                    sizes.append(int(float(size)))
-                except (ValueError, TypeError):
-                    continue
-        if sizes:
-            min_size = min(sizes)
-            # Set max_size to 10000 for the slider, but keep track of the actual max
-            actual_max = max(sizes)
-            return [min_size, min(10000, actual_max), actual_max]
-    return [50, 10000, 15000]  # Default range if data not found
-
-# Extract unique values for a given Category or SubCategory with their occurrence counts
+# Numpy copies of the sheet and its label columns, so row lookups skip pandas boolean indexing
+sheet_values = df.to_numpy()
+category_values = df['Category'].to_numpy() if 'Category' in df.columns else np.empty(0, dtype=object)
+subcategory_values = df['SubCategory'].to_numpy() if 'SubCategory' in df.columns else np.empty(0, dtype=object)
+
+# Positions of the rows whose label equals key
+def find_rows(label_values, key):
+    return np.flatnonzero(label_values == key)
+
+# Convert values to whole numbers (truncated like int(float(value))), with NaN for anything non-numeric or infinite
+def to_whole_numbers(values):
+    numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+    numbers[~np.isfinite(numbers)] = np.nan
+    return np.trunc(numbers)
+
+# Slider bounds for the year and sample size filters, read from the sheet in one cached pass
+@st.cache_data
+def get_slider_bounds():
+    def row_numbers(label_values, key):
+        block = sheet_values[find_rows(label_values, key), 3:]
+        numbers = to_whole_numbers(block[~pd.isna(block)].astype(str))
+        return numbers[~np.isnan(numbers)].astype(int).tolist()
+    
+    years = row_numbers(category_values, 'publication_year')
+    sizes = row_numbers(subcategory_values, 'total_size')
+    
+    bounds = {'year_min': 2011, 'year_max': 2025, 'size_min': 50, 'size_max_slider': 10000, 'size_max_actual': 15000}  # Defaults if data not found
+    if years:
+        bounds['year_min'], bounds['year_max'] = min(years), max(years)
+    if sizes:
+        # Cap the slider at 10000, but keep track of the actual max
+        bounds['size_min'] = min(sizes)
+        bounds['size_max_slider'] = min(10000, max(sizes))
+        bounds['size_max_actual'] = max(sizes)
+    return bounds
+
+# Index the values of a Category or SubCategory row by document: value -> {doc_col: (occurrences, first row)}
+@st.cache_data
+def get_value_index(label_column, key):
+    label_values = category_values if label_column == 'Category' else subcategory_values
+    row_indexes = find_rows(label_values, key)
+    value_index = {}
+    
+    block = sheet_values[row_indexes, 3:]
+    present = ~pd.isna(block)
+    for doc_col, doc_values, doc_present in zip(df.columns[3:], block.T, present.T):
+        for row_index, value in zip(row_indexes[doc_present], doc_values[doc_present]):
+            value = str(value)
+            if value and value != "nan":
+                occurrences = value_index.setdefault(value, {})
+                if doc_col in occurrences:
+                    count, first_row = occurrences[doc_col]
+                    occurrences[doc_col] = (count + 1, first_row)
+                else:
+                    occurrences[doc_col] = (1, row_index)
+    
+    return value_index
+
+# Extract unique values for a given Category or SubCategory with their occurrence counts.
+# Memoized on the arguments, since reruns mostly repeat the same filter combinations; a miss is quick, so no spinner
+@st.cache_data(max_entries=128, show_spinner=False)
 def get_unique_values_filtered(category_name, subcategory_name=None, matching_docs=None):
     """
-    Get unique values with occurrence counts based on filtered documents
+    Get unique values with occurrence counts based on filtered documents.
+    Returns the options (plain values, "All" first) and a mapping from each option to its display label
     """
     value_counts = {}
+    first_seen = {}
     
     # If no matching docs provided, return just "All"
     if not matching_docs:
-        return ["All"]
+        return ["All"], {"All": "All"}
     
     # Handle different conditions based on what we're looking for
     if subcategory_name:
-        # Looking for values in rows where SubCategory equals subcategory_name
-        if 'SubCategory' in df.columns and subcategory_name in df['SubCategory'].values:
-            rows = df[df['SubCategory'] == subcategory_name]
-            
-            # Extract values from matching document columns only
-            for doc_col in matching_docs:
-                col_values = rows[doc_col].dropna().astype(str)
-                for value in col_values:
-                    if value and value != "nan":
-                        if value in value_counts:
-                            value_counts[value] += 1
-                        else:
-                            value_counts[value] = 1
+        value_index = get_value_index('SubCategory', subcategory_name)
     else:
-        # Looking for values in rows where Category equals category_name
-        if 'Category' in df.columns and category_name in df['Category'].values:
-            rows = df[df['Category'] == category_name]
-            
-            # Extract values from matching document columns only
-            for doc_col in matching_docs:
-                col_values = rows[doc_col].dropna().astype(str)
-                for value in col_values:
-                    if value and value != "nan":
-                        if value in value_counts:
-                            value_counts[value] += 1
-                        else:
-                            value_counts[value] = 1
-    
-    # Sort values by their occurrence count in decreasing order
-    sorted_values = sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
-    
-    # Format values with their counts in curly braces
-    formatted_values = [f"{value} {{{count}}}" for value, count in sorted_values]
-    
-    # Add "All" as the first option
-    return ["All"] + formatted_values
-
-
-# Count documents that match the current filter criteria
-def count_matching_documents(year_range, sample_size_range=None, publication_type=None, 
-                            funding_source=None, study_design=None):
-    # Start with all document columns
-    doc_columns = df.columns[3:]
-    matching_docs = []
+        value_index = get_value_index('Category', category_name)
     
-    for doc_col in doc_columns:
-        matches_all_criteria = True
-        
-        # Check year criteria
-        if 'publication_year' in df['Category'].values:
-            year_row = df[df['Category'] == 'publication_year']
-            year_value = year_row[doc_col].iloc[0] if not year_row.empty else None
-            
-            if year_value:
-                try:
-                    year = int(float(year_value))
-                    if year < year_range[0] or year > year_range[1]:
-                        matches_all_criteria = False
-                except (ValueError, TypeError):
-                    matches_all_criteria = False
-        
-        # Check sample size criteria if enabled
-        if sample_size_range and 'total_size' in df['SubCategory'].values:
-            size_row = df[df['SubCategory'] == 'total_size']
-            size_value = size_row[doc_col].iloc[0] if not size_row.empty else None
-            
-            if size_value:
-                try:
-                    size = int(float(size_value))
-                    if size < sample_size_range[0] or size > sample_size_range[1]:
-                        matches_all_criteria = False
-                except (ValueError, TypeError):
-                    matches_all_criteria = False
-        
-        
-        # Check publication type criteria - handle values with counts in curly braces
-        if publication_type and "All" not in publication_type and 'publication_type' in df['Category'].values:
-            pub_row = df[df['Category'] == 'publication_type']
-            pub_value = pub_row[doc_col].iloc[0] if not pub_row.empty else None
-            
-            if pub_value:
-                # Extract just the value part before any curly braces for comparison
-                pub_matches = False
-                for selected_type in publication_type:
-                    # Extract the base value without the count in curly braces
-                    base_type = selected_type.split(' {')[0] if ' {' in selected_type else selected_type
-                    if str(pub_value) == base_type:
-                        pub_matches = True
-                        break
-                
-                if not pub_matches:
-                    matches_all_criteria = False
-        
-        # Check funding source criteria - handle values with counts in curly braces
-        if funding_source and "All" not in funding_source and 'type' in df['SubCategory'].values:
-            fund_row = df[df['SubCategory'] == 'type']
-            fund_value = fund_row[doc_col].iloc[0] if not fund_row.empty else None
-            
-            if fund_value:
-                # Extract just the value part before any curly braces for comparison
-                fund_matches = False
-                for selected_source in funding_source:
-                    # Extract the base value without the count in curly braces
-                    base_source = selected_source.split(' {')[0] if ' {' in selected_source else selected_source
-                    if str(fund_value) == base_source:
-                        fund_matches = True
-                        break
-                
-                if not fund_matches:
-                    matches_all_criteria = False
-        
-        # Check study design criteria - handle values with counts in curly braces
-        if study_design and "All" not in study_design and 'primary_type' in df['SubCategory'].values:
-            design_row = df[df['SubCategory'] == 'primary_type']
-            design_value = design_row[doc_col].iloc[0] if not design_row.empty else None
-            
-            if design_value:
-                # Extract just the value part before any curly braces for comparison
-                design_matches = False
-                for selected_design in study_design:
-                    # Extract the base value without the count in curly braces
-                    base_design = selected_design.split(' {')[0] if ' {' in selected_design else selected_design
-                    if str(design_value) == base_design:
-                        design_matches = True
-                        break
-                
-                if not design_matches:
-                    matches_all_criteria = False
-        
-        # If document matched all criteria, add to the list
-        if matches_all_criteria:
-            matching_docs.append(doc_col)
+    # Count each value over the matching documents only, remembering where it first appears
+    doc_order = {doc_col: position for position, doc_col in enumerate(matching_docs)}
+    for value, occurrences in value_index.items():
+        matched = occurrences.keys() & doc_order.keys()
+        if matched:
+            value_counts[value] = sum(occurrences[doc_col][0] for doc_col in matched)
+            first_seen[value] = min((doc_order[doc_col], occurrences[doc_col][1]) for doc_col in matched)
+    
+    # Sort values by their occurrence count in decreasing order; the stable sort keeps ties in order of first appearance
+    counts = pd.Series(value_counts, dtype='int64')[sorted(value_counts, key=first_seen.get)]
+    counts = counts.sort_values(ascending=False, kind='stable')
     
-    return matching_docs
+    # Label values with their counts in curly braces, with "All" as the first option
+    labels = {"All": "All"}
+    labels.update(zip(counts.index, counts.index.astype(str) + " {" + counts.astype(str) + "}"))
+    
+    return list(labels), labels
+
+
+# Build the per-document filter arrays once: a numeric array for each range filter and
+# one boolean mask per value for each multiselect filter, all aligned to the document columns
+@st.cache_data
+def get_document_attributes():
+    doc_columns = df.columns[3:]
+    attrs = {'documents': np.asarray(doc_columns)}
+    
+    filter_rows = {
+        'year': ('Category', 'publication_year'),
+        'size': ('SubCategory', 'total_size'),
+        'pub_type': ('Category', 'publication_type'),
+        'funding': ('SubCategory', 'type'),
+        'design': ('SubCategory', 'primary_type'),
+    }
+    label_values = {'Category': category_values, 'SubCategory': subcategory_values}
+    for name, (column, key) in filter_rows.items():
+        row_indexes = find_rows(label_values[column], key)
+        values = sheet_values[row_indexes[0], 3:].tolist() if len(row_indexes) else [None] * len(doc_columns)
+        # Documents with an empty value are never excluded by that filter
+        attrs[name + '_unset'] = np.array([not value for value in values], dtype=bool)
+        if name in ('year', 'size'):
+            # NaN marks values that cannot be read as a number, which always fail the range check
+            attrs[name] = to_whole_numbers(values)
+        else:
+            value_labels = np.array([str(value) for value in values])
+            attrs[name] = {label: value_labels == label for label in np.unique(value_labels)}
+    
+    return attrs
+
+# Mask of the documents that pass one filter: a (min, max) range for 'year'/'size', a multiselect selection otherwise
+def document_filter_mask(attrs, name, criteria):
+    if name in ('year', 'size'):
+        if criteria:
+            values = attrs[name]
+            return attrs[name + '_unset'] | ((values >= criteria[0]) & (values <= criteria[1]))
+    elif criteria and "All" not in criteria:
+        selected = attrs[name + '_unset'].copy()
+        for value in criteria:
+            if value in attrs[name]:
+                selected |= attrs[name][value]
+        return selected
+    return np.ones(len(attrs['documents']), dtype=bool)
+
+# Documents that pass all the given filters. Selections are passed as sorted tuples so each
+# filter combination is evaluated once and served from the cache on later reruns
+@st.cache_data(max_entries=128, show_spinner=False)
+def get_matching_documents(year_range, publication_type=(), funding_source=(), study_design=(), sample_size_range=None):
+    attrs = get_document_attributes()
+    filter_mask = document_filter_mask(attrs, 'year', year_range)
+    filter_mask &= document_filter_mask(attrs, 'pub_type', list(publication_type))
+    filter_mask &= document_filter_mask(attrs, 'funding', list(funding_source))
+    filter_mask &= document_filter_mask(attrs, 'design', list(study_design))
+    filter_mask &= document_filter_mask(attrs, 'size', sample_size_range)
+    return attrs['documents'][filter_mask].tolist()
+
+# Normalize a session state selection into a hashable cache key
+def filter_key(selection):
+    return tuple(sorted(selection))
 
 # Get filtered data for specific fields
 def get_filtered_data(field_category, field_subcategory=None, matching_docs=None):
@@ -229,27 +382,237 @@ def get_filtered_data(field_category, field_subcategory=None, matching_docs=None
         return pd.DataFrame()
         
     if field_subcategory:
-        rows = df[(df['Category'] == field_category) & (df['SubCategory'] == field_subcategory)]
+        rows = df.iloc[np.intersect1d(find_rows(category_values, field_category), find_rows(subcategory_values, field_subcategory))]
     else:
-        rows = df[df['Category'] == field_category]
+        rows = df.iloc[find_rows(category_values, field_category)]
     
     if rows.empty:
         return pd.DataFrame()
     
-    # Extract data from matching document columns
+    # Extract data from matching document columns, reading the first matching row once
+    row_values = rows.iloc[0].to_dict()
     result_data = {}
     for doc_col in matching_docs:
         doc_name = doc_col  # Could use doc_col as the document name or extract a more readable name
-        value = rows[doc_col].iloc[0] if not rows.empty else None
+        value = row_values[doc_col]
         if value and not pd.isna(value):
             result_data[doc_name] = value
     
     return pd.DataFrame({'document': list(result_data.keys()), 'value': list(result_data.values())})
 
 
+# Decode a logo image once per process instead of on every rerun
+@st.cache_resource
+def load_logo(path):
+    logo = Image.open(path)
+    logo.load()
+    return logo
+
+SVG_URL = "https://echarts.apache.org/examples/data/asset/geo/Veins_Medical_Diagram_clip_art.svg"
+SVG_CACHE_PATH = os.path.join('.data_cache', 'Veins_Medical_Diagram_clip_art.svg')
+SVG_ETAG_PATH = SVG_CACHE_PATH + '.etag'
+SVG_REVALIDATE_AGE = 24 * 3600  # Seconds before the saved copy is checked against the server again
+# Simplified diagram with the same named organ regions, shipped for when the echarts SVG cannot be fetched
+SVG_ASSET_PATH = os.path.join('Images', 'anatomy_diagram.svg')
+
+def read_text_file(path):
+    """Return the contents of a text file, or None if it cannot be read"""
+    try:
+        with open(path, encoding='utf-8') as text_file:
+            return text_file.read()
+    except OSError:
+        return None
+
+# Load the anatomy diagram SVG. The downloaded copy is kept on disk so restarts do not go back
+# to the network, and is revalidated with its ETag once it is older than SVG_REVALIDATE_AGE.
+# Without network access the saved copy, or else the bundled diagram, is used
+@st.cache_data
+def get_svg_content():
+    """Fetch SVG content from echarts example"""
+    cached_svg = read_text_file(SVG_CACHE_PATH)
+    if cached_svg and time.time() - os.path.getmtime(SVG_CACHE_PATH) < SVG_REVALIDATE_AGE:
+        return cached_svg
+    
+    headers = {}
+    etag = read_text_file(SVG_ETAG_PATH) if cached_svg else None
+    if etag:
+        headers['If-None-Match'] = etag.strip()
+    try:
+        response = requests.get(SVG_URL, headers=headers, timeout=5)
+    except requests.RequestException:
+        response = None
+    
+    if response is not None and response.status_code == 304 and cached_svg:
+        # Unchanged on the server, so the saved copy is good for another period
+        try:
+            os.utime(SVG_CACHE_PATH)
+        except OSError:
+            pass
+        return cached_svg
+    
+    # Only persist an actual SVG, not an error or captive portal page
+    if response is not None and response.status_code == 200 and '<svg' in response.text:
+        try:
+            os.makedirs(os.path.dirname(SVG_CACHE_PATH), exist_ok=True)
+            with open(SVG_CACHE_PATH, 'w', encoding='utf-8') as svg_file:
+                svg_file.write(response.text)
+            with open(SVG_ETAG_PATH, 'w', encoding='utf-8') as etag_file:
+                etag_file.write(response.headers.get('ETag', ''))
+        except OSError:
+            pass
+        return response.text
+    
+    svg_content = cached_svg or read_text_file(SVG_ASSET_PATH)
+    if not svg_content:
+        status = response.status_code if response is not None else "network error"
+        st.error(f"Failed to fetch SVG: {status}")
+    return svg_content
+
+# The anatomy diagram page does not depend on the selected health area, so Streamlit keeps the
+# same iframe mounted across reruns instead of reloading ECharts and the SVG on every button click.
+# The SVG is embedded gzip-compressed and base64-encoded, and the browser decompresses it
+@st.cache_data(show_spinner=False)
+def get_anatomy_diagram_html():
+    svg_content = get_svg_content()
+    if not svg_content:
+        return None
+    svg_base64 = base64.b64encode(gzip.compress(svg_content.encode('utf-8'), mtime=0)).decode('ascii')
+    
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <script src="https://cdn.jsdelivr.net/npm/echarts@5.4.3/dist/echarts.min.js"></script>
+        <style>
+            html, body {{
+                margin: 0;
+                padding: 0;
+                width: 100%;
+                height: 100%;
+                overflow: hidden;
+            }}
+            #main {{
+                width: 100%;
+                height: 100%;
+            }}
+        </style>
+    </head>
+    <body>
+        <div id="main"></div>
+        <script>
+            // Initialize chart
+            var chartDom = document.getElementById('main');
+            var myChart = echarts.init(chartDom);
+            
+            // Organ to highlight once the map is registered
+            var selectedOrgan = null;
+            var mapReady = false;
+            
+            var option = {{
+                tooltip: {{
+                    formatter: function(params) {{
+                        switch(params.name) {{
+                            case 'lung':
+                                return 'Lungs - Respiratory System';
+                            case 'heart':
+                                return 'Heart - Cardiovascular System';
+                            case 'oral':
+                                return 'Oral Cavity - Oral Health';
+                            default:
+                                return params.name;
+                        }}
+                    }}
+                }},
+                geo: {{
+                    map: 'organ_diagram',
+                    roam: false,
+                    emphasis: {{
+                        focus: 'self',
+                        itemStyle: {{
+                            color: '#ff3333',  // Highlighting color
+                            borderWidth: 2,
+                            borderColor: '#ff0000',
+                            shadowBlur: 5,
+                            shadowColor: 'rgba(255, 0, 0, 0.5)'
+                        }}
+                    }}
+                }}
+            }};
+            
+            // Highlight the organ of the selected health area
+            function highlightOrgan(organ) {{
+                selectedOrgan = organ;
+                if (!mapReady) {{
+                    return;
+                }}
+                
+                // First clear any existing highlights
+                myChart.dispatchAction({{
+                    type: 'downplay',
+                    geoIndex: 0
+                }});
+                
+                // Then highlight the requested organ
+                myChart.dispatchAction({{
+                    type: 'highlight',
+                    geoIndex: 0,
+                    name: organ
+                }});
+            }}
+            
+            // The selected organ is posted to this frame on every rerun
+            window.addEventListener('message', function(event) {{
+                if (event.data && event.data.anatomyOrgan) {{
+                    highlightOrgan(event.data.anatomyOrgan);
+                }}
+            }});
+            
+            // Apply an organ that was posted before this frame finished loading
+            try {{
+                if (window.parent.anatomyOrgan) {{
+                    highlightOrgan(window.parent.anatomyOrgan);
+                }}
+            }} catch (e) {{}}
+            
+            // Decompress the SVG, then register the map and draw the chart
+            var svgBytes = Uint8Array.from(atob("{svg_base64}"), function(c) {{ return c.charCodeAt(0); }});
+            var svgStream = new Blob([svgBytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            new Response(svgStream).text().then(function(svg) {{
+                echarts.registerMap('organ_diagram', {{
+                    svg: svg
+                }});
+                myChart.setOption(option);
+                mapReady = true;
+                if (selectedOrgan) {{
+                    highlightOrgan(selectedOrgan);
+                }}
+            }});
+            
+            // Handle window resize
+            window.addEventListener('resize', function() {{
+                myChart.resize();
+            }});
+        </script>
+    </body>
+    </html>
+    """
+
+# Sends the selected organ to the mounted anatomy diagram, and keeps it on the parent page
+# for a diagram that is still loading
+ANATOMY_HIGHLIGHT_SCRIPT = """
+    <script>
+        window.parent.anatomyOrgan = "{organ}";
+        window.parent.document.querySelectorAll('iframe').forEach(function(frame) {{
+            if (frame.contentWindow) {{
+                frame.contentWindow.postMessage({{anatomyOrgan: "{organ}"}}, '*');
+            }}
+        }});
+    </script>
+    """
+
 # Display logo
 try:
-    logo = Image.open("Images/IB-logo.png")
+    logo = load_logo("Images/IB-logo.png")
     st.image(logo, width=200)
 except:
     st.write("Logo image not found.")
@@ -265,54 +628,41 @@ if 'funding_source' not in st.session_state:
 if 'study_design' not in st.session_state:
     st.session_state.study_design = ["All"]
 if 'year_range' not in st.session_state:
-    # Get publication years
-    years = get_publication_years()
-    if years:
-        min_year, max_year = min(years), max(years)
-    else:
-        min_year, max_year = 2011, 2025
-    st.session_state.year_range = (min_year, max_year)
+    slider_bounds = get_slider_bounds()
+    st.session_state.year_range = (slider_bounds['year_min'], slider_bounds['year_max'])
 if 'enable_sample_size' not in st.session_state:
     st.session_state.enable_sample_size = False
 if 'sample_size_filter' not in st.session_state:
-    sample_size_range = get_sample_sizes()
-    st.session_state.sample_size_filter = sample_size_range
-
-# Define callback functions for each multiselect to handle the "All" selection logic
-def on_publication_type_change():
-    if "All" in st.session_state.publication_type_select and len(st.session_state.publication_type_select) > 1:
-        if "All" not in st.session_state.publication_type:
-            st.session_state.publication_type = ["All"]
+    slider_bounds = get_slider_bounds()
+    st.session_state.sample_size_filter = (slider_bounds['size_min'], slider_bounds['size_max_slider'])
+
+# Define callback functions for each multiselect to handle the "All" selection logic:
+# choosing "All" clears the other selections, choosing anything else while "All" is selected drops "All"
+def reconcile_selection(key):
+    selected = st.session_state[f"{key}_select"]
+    if "All" in selected and len(selected) > 1:
+        if "All" not in st.session_state[key]:
+            st.session_state[key] = ["All"]
         else:
-            st.session_state.publication_type = [opt for opt in st.session_state.publication_type_select if opt != "All"]
+            st.session_state[key] = [opt for opt in selected if opt != "All"]
     else:
-        st.session_state.publication_type = st.session_state.publication_type_select
-        
+        st.session_state[key] = selected
+
+def on_publication_type_change():
+    reconcile_selection("publication_type")
+
 def on_funding_source_change():
-    if "All" in st.session_state.funding_source_select and len(st.session_state.funding_source_select) > 1:
-        if "All" not in st.session_state.funding_source:
-            st.session_state.funding_source = ["All"]
-        else:
-            st.session_state.funding_source = [opt for opt in st.session_state.funding_source_select if opt != "All"]
-    else:
-        st.session_state.funding_source = st.session_state.funding_source_select
-        
+    reconcile_selection("funding_source")
+
 def on_study_design_change():
-    if "All" in st.session_state.study_design_select and len(st.session_state.study_design_select) > 1:
-        if "All" not in st.session_state.study_design:
-            st.session_state.study_design = ["All"]
-        else:
-            st.session_state.study_design = [opt for opt in st.session_state.study_design_select if opt != "All"]
-    else:
-        st.session_state.study_design = st.session_state.study_design_select
+    reconcile_selection("study_design")
 
 def on_year_range_change():
     st.session_state.year_range = st.session_state.year_range_slider
     
 # Update the on_sample_size_change function to handle the 10000+ case
 def on_sample_size_change():
-    sample_size_range = get_sample_sizes()
-    actual_max = sample_size_range[2]
+    actual_max = get_slider_bounds()['size_max_actual']
     
     # If the max slider value is 10000, set the actual filter to the true maximum
     if st.session_state.sample_size_slider[1] >= 10000:
@@ -324,10 +674,154 @@ def on_enable_sample_size_change():
     st.session_state.enable_sample_size = st.session_state.enable_sample_size_checkbox
 
 
+# Filters live in a fragment, so moving a slider or changing a multiselect reruns only this block
+@st.fragment
+def filter_sidebar():
+    st.subheader("Filters")
+    
+    # Get the year and sample size slider bounds
+    slider_bounds = get_slider_bounds()
+    min_year, max_year = slider_bounds['year_min'], slider_bounds['year_max']
+    
+    # Year range slider
+    year_range = st.slider(
+        "Year Range", 
+        min_value=min_year, 
+        max_value=max_year, 
+        value=st.session_state.year_range, 
+        step=1,
+        key="year_range_slider",
+        on_change=on_year_range_change
+    )
+    
+    # First, filter by year range to get initial matching documents. Each stage below is
+    # memoized on the selections made so far
+    year_key = tuple(st.session_state.year_range)
+    initial_docs = get_matching_documents(year_key)
+    
+    
+    # First filter: Publication Type with updated counts
+    publication_types, publication_type_labels = get_unique_values_filtered(category_name="publication_type", 
+                                                matching_docs=initial_docs)
+    
+    # Keep only the selections that are still available, otherwise reset to "All"
+    st.session_state.publication_type = [value for value in st.session_state.publication_type if value in publication_type_labels] or ["All"]
+    
+    # Options hold the plain values and are labelled with their counts
+    st.multiselect(
+        "Publication Type", 
+        publication_types, 
+        key="publication_type_select",
+        default=st.session_state.publication_type,
+        format_func=publication_type_labels.get,
+        on_change=on_publication_type_change
+    )
+    
+    # Filter docs after applying publication type
+    publication_type_key = filter_key(st.session_state.publication_type)
+    docs_after_pub_type = get_matching_documents(year_key, publication_type_key)
+    
+    # Second filter: Funding Source with updated counts
+    funding_sources, funding_source_labels = get_unique_values_filtered(category_name=None, subcategory_name="type", 
+                                             matching_docs=docs_after_pub_type)
+    
+    # Keep only the selections that are still available, otherwise reset to "All"
+    st.session_state.funding_source = [value for value in st.session_state.funding_source if value in funding_source_labels] or ["All"]
+    
+    # Options hold the plain values and are labelled with their counts
+    st.multiselect(
+        "Funding Source", 
+        funding_sources, 
+        key="funding_source_select",
+        default=st.session_state.funding_source,
+        format_func=funding_source_labels.get,
+        on_change=on_funding_source_change
+    )
+    
+    # Filter docs after applying funding source
+    funding_source_key = filter_key(st.session_state.funding_source)
+    docs_after_funding = get_matching_documents(year_key, publication_type_key, funding_source_key)
+    
+    # Third filter: Study Design with updated counts
+    study_designs, study_design_labels = get_unique_values_filtered(category_name=None, subcategory_name="primary_type", 
+                                          matching_docs=docs_after_funding)
+    
+    # Keep only the selections that are still available, otherwise reset to "All"
+    st.session_state.study_design = [value for value in st.session_state.study_design if value in study_design_labels] or ["All"]
+    
+    # Options hold the plain values and are labelled with their counts
+    st.multiselect(
+        "Study Design", 
+        study_designs, 
+        key="study_design_select",
+        default=st.session_state.study_design,
+        format_func=study_design_labels.get,
+        on_change=on_study_design_change
+    )
+    
+    # Checkbox to enable/disable sample size range
+    enable_sample_size = st.checkbox(
+        "Enable Sample Size Filter", 
+        value=st.session_state.enable_sample_size,
+        key="enable_sample_size_checkbox",
+        on_change=on_enable_sample_size_change
+    )
+    
+    # Sample size range - only shown if checkbox is enabled
+    if enable_sample_size:
+        min_size = slider_bounds['size_min']
+        slider_max = slider_bounds['size_max_slider']  # This is either the actual max or 10000
+        actual_max = slider_bounds['size_max_actual']  # The true maximum value
+        
+        # Calculate the current slider values, respecting the 10000+ threshold
+        current_min = st.session_state.sample_size_filter[0]
+        current_max = st.session_state.sample_size_filter[1]
+        
+        # Set slider min/max values
+        slider_min = current_min if current_min >= min_size else min_size
+        adjusted_max = current_max
+        if current_max > 10000:
+            adjusted_max = 10000
+        
+        # Create the slider with custom formatting
+        sample_size_values = st.slider(
+            "Sample Size Range", 
+            min_value=min_size, 
+            max_value=slider_max,
+            value=(slider_min, adjusted_max),
+            key="sample_size_slider",
+            on_change=on_sample_size_change,
+            format="%d"  # Default format
+        )
+        
+        # Custom label for the max value
+        if sample_size_values[1] >= 10000:
+            st.text(f"Selected range: {sample_size_values[0]} to 10000+")
+            # Update the actual filter to include all values above 10000
+            st.session_state.sample_size_filter = (sample_size_values[0], actual_max)
+        else:
+            # Normal case, just use the slider values
+            st.session_state.sample_size_filter = sample_size_values
+    else:
+        sample_size_filter = None
+    
+    # Apply the remaining filters and get matching documents
+    sample_size_key = tuple(st.session_state.sample_size_filter) if st.session_state.enable_sample_size else None
+    matching_docs = get_matching_documents(year_key, publication_type_key, funding_source_key,
+                                           filter_key(st.session_state.study_design), sample_size_key)
+    
+    # Display total number of documents selected
+    st.subheader(f"Total Documents: {len(matching_docs)}")
+    
+    # Only rerun the rest of the app when the selected documents actually changed
+    st.session_state.matching_docs = matching_docs
+    if st.session_state.rendered_matching_docs is not None and matching_docs != st.session_state.rendered_matching_docs:
+        st.rerun()
+
 # Add a sidebar with filters
 with st.sidebar:
     
-    sidebar_logo = Image.open("Images/sigmoid-logo.png")
+    sidebar_logo = load_logo("Images/sigmoid-logo.png")
     st.image(sidebar_logo, width=120) 
         
     st.subheader("API Configuration")
@@ -345,51 +839,7 @@ with st.sidebar:
     )
     st.session_state.openai_api_key = api_key
                 
-    st.markdown("""
-    <style>
-    /* Style for regular buttons - including all states */
-    div.stButton > button:first-child {
-        background-color: #5aac90;
-        color: white;
-        border: 2px solid transparent;  /* Start with transparent border */
-    }
-    
-    div.stButton > button:hover {
-        background-color: #5aac90;
-        color: white;
-        border: 2px solid orange;  /* Thicker red border on hover */
-        box-sizing: border-box;  /* Ensure border doesn't change button size */
-    }
-    
-    div.stButton > button:active, div.stButton > button:focus {
-        background-color: #5aac90;
-        color: yellow !important;
-        border: 2px solid orange !important;  /* Thicker red border on active/focus */
-        box-shadow: none;
-    }
-    
-    /* Style for download buttons - including all states */
-    div.stDownloadButton > button:first-child {
-        background-color: #5aac90;
-        color: white;
-        border: 1px solid transparent;  /* Start with transparent border */
-    }
-    
-    div.stDownloadButton > button:hover {
-        background-color: #5aac90;
-        color: white;
-        border: 3px solid red;  /* Thicker red border on hover */
-        box-sizing: border-box;  /* Ensure border doesn't change button size */
-    }
-    
-    div.stDownloadButton > button:active, div.stDownloadButton > button:focus {
-        background-color: #5aac90;
-        color: white !important;
-        border: 3px solid red !important;  /* Thicker red border on active/focus */
-        box-shadow: none;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(SIDEBAR_BUTTON_CSS, unsafe_allow_html=True)
     
     # Add these new session state variables
     if "insights_in_progress" not in st.session_state:
@@ -401,6 +851,10 @@ with st.sidebar:
     if "current_processing_tab" not in st.session_state:
         st.session_state.current_processing_tab = -1
     
+    # Batch mode submits every tab's insights as one OpenAI Batch API job
+    use_batch_api = st.checkbox("Use Batch API (lower cost, slower)", value=False,
+                                help="Submit all tabs as a single batch at half the API cost. Batches can take several minutes to complete.")
+    
     # Generate Insights button in sidebar with the custom styling applied
     generate_button = st.button("Generate Insights") and api_key
     
@@ -419,66 +873,12 @@ with st.sidebar:
         st.session_state.completed_tabs = set()
         st.session_state.current_processing_tab = 0  # Start with the first tab
         st.session_state.current_tab_index = 0  # Start with the first tab
+        st.session_state.insights_batch_mode = use_batch_api
+        st.session_state.batch_requests = {}
         st.rerun()  # Trigger a rerun to start the process
         
     # Add custom CSS for the segmented progress bar
-    st.markdown("""
-    <style>
-    .progress-container {
-        margin-top: 20px;
-        margin-bottom: 20px;
-    }
-    .progress-header {
-        font-size: 0.9rem;
-        font-weight: bold;
-        margin-bottom: 10px;
-    }
-    .segments-container {
-        display: flex;
-        height: 12px;
-        width: 100%;
-        border-radius: 8px;
-        overflow: hidden;
-    }
-    .segment {
-        flex: 1;
-        height: 100%;
-        margin: 0 1px;
-    }
-    .not-started {
-        background-color: #ffebeb;  /* light pink for not started */
-    }
-    .waiting {
-        background-color: #ffcccb;  /* Light red for waiting */
-    }
-    .processing {
-        background-color: #FF7417;  /* Orange for processing (Imperial Brands color) */
-        animation: pulse 1.5s infinite;
-    }
-    .completed {
-        background-color: #5aac90;  /* Green for completed */
-    }
-    .segment-labels {
-        display: flex;
-        justify-content: space-between;
-        margin-top: 5px;
-        font-size: 0.7rem;
-    }
-    .segment-label {
-        flex: 1;
-        text-align: center;
-        white-space: nowrap;
-        overflow: hidden;
-        text-overflow: ellipsis;
-        padding: 0 1px;
-    }
-    @keyframes pulse {
-        0% { opacity: 0.5; }
-        50% { opacity: 1; }
-        100% { opacity: 0.5; }
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(PROGRESS_BAR_CSS, unsafe_allow_html=True)
     
     # Display the segmented progress bar
     st.markdown("<div class='progress-container'>", unsafe_allow_html=True)
@@ -499,1222 +899,358 @@ with st.sidebar:
         # Add segment
         segments_html += f"<div class='segment {status_class}'></div>"
     
-    segments_html += "</div>"
-    
-    st.markdown(segments_html, unsafe_allow_html=True)
-    
-    # Add segment labels
-    # label_html = "<div class='segment-labels'>"
-    # for tab in tab_names:
-    #     label_html += f"<div class='segment-label'>{tab}</div>"
-    # label_html += "</div>"
-    # st.markdown(label_html, unsafe_allow_html=True)
-    
-    # Add a text indicator of what's being processed
-    if st.session_state.insights_in_progress and st.session_state.current_processing_tab >= 0:
-        current_tab = tab_names[st.session_state.current_processing_tab]
-        st.markdown(f"<p style='text-align: center; margin-top: 0px; font-size: 0.8rem;'>Processing: {current_tab}</p>", unsafe_allow_html=True)
-    elif st.session_state.completed_tabs and len(st.session_state.completed_tabs) == len(tab_names):
-        st.markdown("<p style='text-align: center; margin-top: 0px; color: green; font-size: 0.8rem;'>✓ All insights generated!</p>", unsafe_allow_html=True)
-        
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    
-    st.subheader("Filters")
-    
-    # Get publication years
-    years = get_publication_years()
-    if years:
-        min_year, max_year = min(years), max(years)
-    else:
-        min_year, max_year = 2011, 2025
-    
-    # Year range slider
-    year_range = st.slider(
-        "Year Range", 
-        min_value=min_year, 
-        max_value=max_year, 
-        value=st.session_state.year_range, 
-        step=1,
-        key="year_range_slider",
-        on_change=on_year_range_change
-    )
-    
-    # First, filter by year range to get initial matching documents
-    initial_docs = count_matching_documents(
-        year_range=st.session_state.year_range,
-        sample_size_range=None,
-        publication_type=["All"],
-        funding_source=["All"],
-        study_design=["All"]
-    )
-    
-    
-    # First filter: Publication Type with updated counts
-    publication_types = get_unique_values_filtered(category_name="publication_type", 
-                                                matching_docs=initial_docs)
-    
-    # Extract base values (without counts) from available options
-    base_pub_types = ["All"] + [opt.split(" {")[0] for opt in publication_types if opt != "All"]
-    
-    # Check if current selected values' base names are in available options, otherwise reset to "All"
-    base_selected_pub_types = [val.split(" {")[0] if " {" in val else val for val in st.session_state.publication_type]
-    
-    # Keep selections whose base values are in the available options
-    valid_pub_types = []
-    for i, base_val in enumerate(base_selected_pub_types):
-        if base_val in base_pub_types or base_val == "All":
-            # Find the matching option with updated count
-            if base_val == "All":
-                valid_pub_types.append("All")
-            else:
-                # Find the option in publication_types that has the same base value
-                matching_options = [opt for opt in publication_types if opt.split(" {")[0] == base_val]
-                if matching_options:
-                    valid_pub_types.append(matching_options[0])  # Use the option with updated count
-    
-    if not valid_pub_types:
-        st.session_state.publication_type = ["All"]
-    else:
-        st.session_state.publication_type = valid_pub_types
-    
-    # Apply Publication Type filter
-    st.multiselect(
-        "Publication Type", 
-        publication_types, 
-        key="publication_type_select",
-        default=st.session_state.publication_type,
-        on_change=on_publication_type_change
-    )
-    
-    # Filter docs after applying publication type
-    docs_after_pub_type = count_matching_documents(
-        year_range=st.session_state.year_range,
-        sample_size_range=None,
-        publication_type=st.session_state.publication_type,
-        funding_source=["All"],
-        study_design=["All"]
-    )
-    
-    # Second filter: Funding Source with updated counts
-    funding_sources = get_unique_values_filtered(category_name=None, subcategory_name="type", 
-                                             matching_docs=docs_after_pub_type)
-    
-    # Extract base values (without counts) from available options
-    base_funding_sources = ["All"] + [opt.split(" {")[0] for opt in funding_sources if opt != "All"]
-    
-    # Check if current selected values' base names are in available options, otherwise reset to "All"
-    base_selected_funding_sources = [val.split(" {")[0] if " {" in val else val for val in st.session_state.funding_source]
-    
-    # Keep selections whose base values are in the available options
-    valid_funding_sources = []
-    for i, base_val in enumerate(base_selected_funding_sources):
-        if base_val in base_funding_sources or base_val == "All":
-            # Find the matching option with updated count
-            if base_val == "All":
-                valid_funding_sources.append("All")
-            else:
-                # Find the option in funding_sources that has the same base value
-                matching_options = [opt for opt in funding_sources if opt.split(" {")[0] == base_val]
-                if matching_options:
-                    valid_funding_sources.append(matching_options[0])  # Use the option with updated count
-    
-    if not valid_funding_sources:
-        st.session_state.funding_source = ["All"]
-    else:
-        st.session_state.funding_source = valid_funding_sources
-    
-    # Apply Funding Source filter
-    st.multiselect(
-        "Funding Source", 
-        funding_sources, 
-        key="funding_source_select",
-        default=st.session_state.funding_source,
-        on_change=on_funding_source_change
-    )
-    
-    # Filter docs after applying funding source
-    docs_after_funding = count_matching_documents(
-        year_range=st.session_state.year_range,
-        sample_size_range=None,
-        publication_type=st.session_state.publication_type,
-        funding_source=st.session_state.funding_source,
-        study_design=["All"]
-    )
+    segments_html += "</div>"
     
-    # Third filter: Study Design with updated counts
-    study_designs = get_unique_values_filtered(category_name=None, subcategory_name="primary_type", 
-                                          matching_docs=docs_after_funding)
+    st.markdown(segments_html, unsafe_allow_html=True)
     
-    # Extract base values (without counts) from available options
-    base_study_designs = ["All"] + [opt.split(" {")[0] for opt in study_designs if opt != "All"]
-    
-    # Check if current selected values' base names are in available options, otherwise reset to "All"
-    base_selected_study_designs = [val.split(" {")[0] if " {" in val else val for val in st.session_state.study_design]
-    
-    # Keep selections whose base values are in the available options
-    valid_study_designs = []
-    for i, base_val in enumerate(base_selected_study_designs):
-        if base_val in base_study_designs or base_val == "All":
-            # Find the matching option with updated count
-            if base_val == "All":
-                valid_study_designs.append("All")
-            else:
-                # Find the option in study_designs that has the same base value
-                matching_options = [opt for opt in study_designs if opt.split(" {")[0] == base_val]
-                if matching_options:
-                    valid_study_designs.append(matching_options[0])  # Use the option with updated count
-    
-    if not valid_study_designs:
-        st.session_state.study_design = ["All"]
-    else:
-        st.session_state.study_design = valid_study_designs
+    # Add segment labels
+    # label_html = "<div class='segment-labels'>"
+    # for tab in tab_names:
+    #     label_html += f"<div class='segment-label'>{tab}</div>"
+    # label_html += "</div>"
+    # st.markdown(label_html, unsafe_allow_html=True)
     
-    # Apply Study Design filter
-    st.multiselect(
-        "Study Design", 
-        study_designs, 
-        key="study_design_select",
-        default=st.session_state.study_design,
-        on_change=on_study_design_change
-    )
+    # Add a text indicator of what's being processed
+    if st.session_state.insights_in_progress and st.session_state.current_processing_tab >= 0:
+        current_tab = tab_names[st.session_state.current_processing_tab]
+        st.markdown(f"<p style='text-align: center; margin-top: 0px; font-size: 0.8rem;'>Processing: {current_tab}</p>", unsafe_allow_html=True)
+    elif st.session_state.completed_tabs and len(st.session_state.completed_tabs) == len(tab_names):
+        st.markdown("<p style='text-align: center; margin-top: 0px; color: green; font-size: 0.8rem;'>✓ All insights generated!</p>", unsafe_allow_html=True)
+        
+    st.markdown("</div>", unsafe_allow_html=True)
     
-    # Checkbox to enable/disable sample size range
-    enable_sample_size = st.checkbox(
-        "Enable Sample Size Filter", 
-        value=st.session_state.enable_sample_size,
-        key="enable_sample_size_checkbox",
-        on_change=on_enable_sample_size_change
-    )
     
-    # Sample size range - only shown if checkbox is enabled
-    if enable_sample_size:
-        sample_size_range = get_sample_sizes()
-        min_size = sample_size_range[0]
-        slider_max = sample_size_range[1]  # This is either the actual max or 10000
-        actual_max = sample_size_range[2]  # The true maximum value
-        
-        # Calculate the current slider values, respecting the 10000+ threshold
-        current_min = st.session_state.sample_size_filter[0]
-        current_max = st.session_state.sample_size_filter[1]
-        
-        # Set slider min/max values
-        slider_min = current_min if current_min >= min_size else min_size
-        adjusted_max = current_max
-        if current_max > 10000:
-            adjusted_max = 10000
-        
-        # Create the slider with custom formatting
-        sample_size_values = st.slider(
-            "Sample Size Range", 
-            min_value=min_size, 
-            max_value=slider_max,
-            value=(slider_min, adjusted_max),
-            key="sample_size_slider",
-            on_change=on_sample_size_change,
-            format="%d"  # Default format
-        )
-        
-        # Custom label for the max value
-        if sample_size_values[1] >= 10000:
-            st.text(f"Selected range: {sample_size_values[0]} to 10000+")
-            # Update the actual filter to include all values above 10000
-            st.session_state.sample_size_filter = (sample_size_values[0], actual_max)
-        else:
-            # Normal case, just use the slider values
-            st.session_state.sample_size_filter = sample_size_values
-    else:
-        sample_size_filter = None
+    # Documents the rest of the page is rendered with on this run
+    st.session_state.rendered_matching_docs = st.session_state.get('matching_docs')
+    filter_sidebar()
         
 
-# Apply filters and get matching documents
-matching_docs = count_matching_documents(
-    year_range=st.session_state.year_range,
-    sample_size_range=st.session_state.sample_size_filter if st.session_state.enable_sample_size else None,
-    publication_type=st.session_state.publication_type,
-    funding_source=st.session_state.funding_source,
-    study_design=st.session_state.study_design
-)
+matching_docs = st.session_state.matching_docs
 
-# Display total number of documents selected in the sidebar
-with st.sidebar:
-    st.subheader(f"Total Documents: {len(matching_docs)}")
 
+# Tabs. Only the selected tab's body runs on a rerun, so the tabs are picked with a radio
+# styled as a tab bar instead of st.tabs, which runs the body of every tab
+st.markdown(TAB_SELECTOR_CSS, unsafe_allow_html=True)
 
-# Tabs
-tabs = st.tabs(["Overview", "Adverse Events", "Perceived Benefits", "Health Outcomes", "Research Trends", 
-                "Contradictions & Conflicts", "Bias in Research", "Publication Level"])
+# While insights are generated tab by tab, show the tab that is being processed
+if (st.session_state.insights_in_progress and not st.session_state.get("insights_batch_mode", False)
+        and st.session_state.current_processing_tab >= 0):
+    st.session_state.active_tab = tab_names[st.session_state.current_processing_tab]
+
+active_tab = tab_names.index(st.radio(
+    "Tab",
+    tab_names,
+    horizontal=True,
+    key="active_tab",
+    label_visibility="collapsed",
+    disabled=st.session_state.insights_in_progress
+))
+
+# Every tab shows the same warning when the filters leave no documents
+if not matching_docs:
+    st.warning("No documents match the selected filters. Please adjust your filter criteria.")
+
+    # No tab can generate insights, so stop the run instead of leaving the tab bar disabled
+    if st.session_state.insights_in_progress and not st.session_state.get("insights_batch_mode", False):
+        st.session_state.insights_in_progress = False
+        st.session_state.progress_status = ["not_started"] * len(tab_names)
+        st.session_state.current_processing_tab = -1
+        st.session_state.current_tab_index = -1
+        st.rerun()
 
 # Overview Tab (Tab 0)
-with tabs[0]:
-    if matching_docs:
-        col1, col2 = st.columns([1, 1])
-        
-        overview_prompt = """As an R&D specialist analyzing e-cigarette research, focus on extracting specific, measurable data points and actionable insights.
-            Avoid generic safety statements and instead provide precise, quantitative data that can inform product development decisions.
-            
-            Key areas to emphasize:
-            1. Specific chemicals/ingredients and their precise concentrations that show improved safety profiles
-            2. Exact device parameters (temperature ranges, wattage levels, coil materials) associated with reduced harmful outputs
-            3. Quantitative comparisons between device generations or design features (provide exact percentages or values)
-            4. Specific flavor compounds and their safety/satisfaction metrics with exact measurements
-            5. Numerical data on user satisfaction correlated with specific product characteristics
-            6. Precise operating parameters that optimize nicotine delivery while minimizing harmful constituents
-            
-            Always prioritize quantitative data and specific technical details that directly enable product improvement."""
-
-
-        categories_to_extract = {
-            "Key Findings": [
-                "main_conclusions", 
-                "statistical_summary.primary_outcomes", 
-                "statistical_summary.secondary_outcomes", 
-                "novel_findings", 
-                "limitations", 
-                "generalizability", 
-                "future_research_suggestions", 
-                "contradictions.conflicts_with_literature",
-                "contradictions.internal_contradictions"
-            ],
-            "Causal Mechanisms": [
-                "chemicals_implicated.name",
-                "chemicals_implicated.level_detected",
-                "chemicals_implicated.effects",
-                "chemicals_implicated.evidence_strength",
-                "biological_pathways.pathway",
-                "biological_pathways.description",
-                "device_factors.factor",
-                "device_factors.effects",
-                "usage_pattern_factors.pattern",
-                "usage_pattern_factors.effects"
-            ],
-            "R&D Insights": [
-                "harmful_ingredients.name",
-                "harmful_ingredients.health_impact",
-                "harmful_ingredients.comparison_to_cigarettes",
-                "device_design_implications.feature",
-                "device_design_implications.impact",
-                "comparative_benefits.vs_traditional_cigarettes.benefit",
-                "comparative_benefits.vs_traditional_cigarettes.evidence_strength",
-                "potential_innovation_areas.area",
-                "operating_parameters.temperature",
-                "operating_parameters.wattage"
-            ],
-            "Study Characteristics": [
-                "study_design.primary_type",
-                "study_design.secondary_features",
-                "study_design.time_periods",
-                "sample_characteristics.total_size",
-                "sample_characteristics.user_groups",
-                "methodology.e_cigarette_specifications.device_types",
-                "methodology.e_cigarette_specifications.nicotine_content.concentrations",
-                "methodology.data_collection_method"
-            ],
-            "Health Outcomes": [
-                "respiratory_effects.findings.description",
-                "cardiovascular_effects.findings.description",
-                "oral_health.periodontal_health.description",
-                "oral_health.inflammatory_biomarkers.description",
-                "neurological_effects.description",
-                "psychiatric_effects.description",
-                "cancer_risk.description",
-                "other_health_outcomes.description"
-            ],
-        }
-            
-        
-        with col1:
-            
-            display_insights(
-                df, 
-                matching_docs,
-                section_title="Research Insights",
-                topic_name="Overall",
-                categories_to_extract=categories_to_extract,
-                custom_focus_prompt=overview_prompt,
-                tab_index=0  # Add tab index
-            )
-            
+elif active_tab == 0:
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
         
-        with col2:
-            # Use the imported function to display visualizations
-            display_publication_distribution(df, matching_docs)
-            
-        display_sankey_dropdown(categories_to_extract, "Overview")
+        display_insights(
+            df, 
+            matching_docs,
+            section_title="Research Insights",
+            topic_name="Overall",
+            categories_to_extract=OVERVIEW_CATEGORIES,
+            custom_focus_prompt=OVERVIEW_PROMPT,
+            tab_index=0  # Add tab index
+        )
         
-        # Display trending research in the Overview tab
-        st.markdown("---")
-        display_trending_research(df, df.columns[3:])
+    
+    with col2:
+        # Use the imported function to display visualizations
+        display_publication_distribution(df, matching_docs)
         
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
+    display_sankey_dropdown(OVERVIEW_CATEGORIES, "Overview")
+    
+    # Display trending research in the Overview tab
+    st.markdown("---")
+    display_trending_research(df, df.columns[3:])
+    
         
         
 # Tab 1 (Adverse Events)
-with tabs[1]:
-    if matching_docs:
-        col1, col2 = st.columns([0.85, 1])
-        
-        with col1:
-            
-            adverse_events_prompt = """As an R&D specialist analyzing e-cigarette research, focus exclusively on actionable data that identifies specific device factors, ingredients, or operating parameters linked to adverse events.
-                Avoid general statements about e-cigarette safety and instead extract precise technical information that can drive product improvements.
-                
-                Emphasize:
-                1. Exact chemical compounds/ingredients at specific concentrations causing adverse effects (e.g., "formaldehyde at >40 μg/puff when device exceeds 240°C")
-                2. Precise device characteristics (temperature, wattage, coil material) associated with reduced adverse events
-                3. Quantitative comparison data showing which design elements produce fewer adverse events (provide numerical values)
-                4. Specific causal pathways between device parameters and biological effects with measured values
-                5. Time-dependent adverse event profiles with specific usage patterns (duration, frequency, inhalation technique)
-                6. Particular e-liquid formulations showing reduced risk profiles with supporting measurements
-                
-                Include exact percentages, concentrations, and measurements whenever available."""
-
-
-            # Define categories specific to adverse events
-            adverse_events_categories = {
-                "Health Outcomes": [
-                    "respiratory_effects.measured_outcomes",
-                    "respiratory_effects.findings.description",
-                    "respiratory_effects.findings.comparative_results",
-                    "respiratory_effects.specific_conditions.asthma",
-                    "respiratory_effects.specific_conditions.copd",
-                    "respiratory_effects.lung_function_tests.results",
-                    "cardiovascular_effects.measured_outcomes",
-                    "cardiovascular_effects.findings.description",
-                    "cardiovascular_effects.blood_pressure",
-                    "cardiovascular_effects.heart_rate",
-                    "neurological_effects.specific_outcomes",
-                    "psychiatric_effects.specific_outcomes",
-                    "other_health_outcomes.description"
-                ],
-                "Self-Reported Effects": [
-                    "adverse_events.oral_events.sore_dry_mouth.overall_percentage",
-                    "adverse_events.oral_events.sore_dry_mouth.group_percentages",
-                    "adverse_events.oral_events.cough.overall_percentage",
-                    "adverse_events.oral_events.cough.group_percentages",
-                    "adverse_events.respiratory_events.breathing_difficulties.overall_percentage",
-                    "adverse_events.respiratory_events.chest_pain.overall_percentage",
-                    "adverse_events.neurological_events.headache.overall_percentage",
-                    "adverse_events.neurological_events.dizziness.overall_percentage",
-                    "adverse_events.cardiovascular_events.heart_palpitation.overall_percentage",
-                    "adverse_events.total_adverse_events.overall_percentage",
-                    "adverse_events.systemic_events"
-                ],
-                "Causal Mechanisms": [
-                    "chemicals_implicated.name",
-                    "chemicals_implicated.effects",
-                    "chemicals_implicated.evidence_strength",
-                    "biological_pathways.pathway",
-                    "device_factors.factor",
-                    "device_factors.effects",
-                    "usage_pattern_factors.pattern"
-                ],
-                "Key Findings": [
-                    "main_conclusions",
-                    "limitations",
-                    "novel_findings"
-                ]
-            }
-            
-            display_insights(
-                df, 
-                matching_docs,
-                section_title="Adverse Events Analysis",
-                topic_name="Adverse Events",
-                categories_to_extract=adverse_events_categories,
-                custom_focus_prompt=adverse_events_prompt,
-                tab_index=1  # Add tab index
-            )
-            
-        with col2:
-            render_harmful_ingredients_visualization(df, matching_docs)
+elif active_tab == 1:
+    col1, col2 = st.columns([0.85, 1])
     
-        display_sankey_dropdown(adverse_events_categories, "Adverse Events", height = 400)
+    with col1:
         
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
+        display_insights(
+            df, 
+            matching_docs,
+            section_title="Adverse Events Analysis",
+            topic_name="Adverse Events",
+            categories_to_extract=ADVERSE_EVENTS_CATEGORIES,
+            custom_focus_prompt=ADVERSE_EVENTS_PROMPT,
+            tab_index=1  # Add tab index
+        )
+        
+    with col2:
+        render_harmful_ingredients_visualization(df, matching_docs)
+
+    display_sankey_dropdown(ADVERSE_EVENTS_CATEGORIES, "Adverse Events", height = 400)
+    
 
 
 # Tab 2 (Perceived Benefits)
-with tabs[2]:
-    if matching_docs:
-        col1, col2 = st.columns([1.5, 1])
+elif active_tab == 2:
+    col1, col2 = st.columns([1.5, 1])
+    
+    with col1:
         
-        with col1:
-            
-            perceived_benefits_prompt = """As an R&D specialist analyzing e-cigarette research, focus exclusively on specific, measurable benefits that can be directly linked to product characteristics.
-                Avoid general statements about user satisfaction and instead extract precise technical information that can enhance product appeal and efficacy.
-                
-                Emphasize:
-                1. Exact quantitative improvements in biomarkers or health indicators with specific device types/settings
-                2. Precise sensory attributes (with numerical ratings when available) linked to specific flavor compounds 
-                3. Detailed user satisfaction metrics correlated with particular product features (provide numerical ratings)
-                4. Specific nicotine delivery parameters that optimize satisfaction while minimizing side effects (exact values)
-                5. Particular device/e-liquid combinations showing superior user experience with supporting data
-                6. Quantitative data on specific product attributes that drive successful transition from combustible cigarettes
-                
-                Include exact percentages, preference ratings, and measured effects whenever available."""
-
-
-
-            # Define categories specific to perceived benefits
-            perceived_benefits_categories = {
-                "Self-Reported Effects": [
-                    "perceived_health_improvements.sensory.smell.overall_percentage",
-                    "perceived_health_improvements.sensory.smell.group_percentages",
-                    "perceived_health_improvements.sensory.taste.overall_percentage",
-                    "perceived_health_improvements.sensory.taste.group_percentages",
-                    "perceived_health_improvements.sensory.other_sensory_improvements",
-                    "perceived_health_improvements.physical.breathing.overall_percentage",
-                    "perceived_health_improvements.physical.physical_status.overall_percentage",
-                    "perceived_health_improvements.physical.stamina.overall_percentage",
-                    "perceived_health_improvements.physical.other_physical_improvements",
-                    "perceived_health_improvements.mental.mood.overall_percentage",
-                    "perceived_health_improvements.mental.sleep_quality.overall_percentage",
-                    "perceived_health_improvements.quality_of_life.overall_qol",
-                    "perceived_health_improvements.quality_of_life.specific_domains"
-                ],
-                "Behavioral Patterns": [
-                    "smoking_cessation.success_rates",
-                    "smoking_cessation.comparison_to_other_methods",
-                    "smoking_cessation.relapse_rates",
-                    "reasons_for_use.primary_reasons",
-                    "reasons_for_use.secondary_reasons",
-                    "reasons_for_use.demographic_differences"
-                ],
-                "R&D Insights": [
-                    "comparative_benefits.vs_traditional_cigarettes.benefit",
-                    "comparative_benefits.vs_traditional_cigarettes.magnitude",
-                    "comparative_benefits.vs_other_nicotine_products",
-                    "consumer_experience_factors.factor",
-                    "consumer_experience_factors.health_implication",
-                    "consumer_experience_factors.optimization_suggestion"
-                ],
-                "Key Findings": [
-                    "main_conclusions",
-                    "novel_findings"
-                ]
-            }
-            
-            display_insights(
-                df, 
-                matching_docs,
-                section_title="Perceived Benefits Analysis",
-                topic_name="Perceived Benefits",
-                categories_to_extract=perceived_benefits_categories,
-                custom_focus_prompt=perceived_benefits_prompt,
-                tab_index=2  # Add tab index
-            )
-            
-        # with col2:
-        #     render_perceived_benefits_visualization(df, matching_docs)
-
-        display_sankey_dropdown(perceived_benefits_categories, "Perceived Benefits", height=350)
+        display_insights(
+            df, 
+            matching_docs,
+            section_title="Perceived Benefits Analysis",
+            topic_name="Perceived Benefits",
+            categories_to_extract=PERCEIVED_BENEFITS_CATEGORIES,
+            custom_focus_prompt=PERCEIVED_BENEFITS_PROMPT,
+            tab_index=2  # Add tab index
+        )
         
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
+    # with col2:
+    #     render_perceived_benefits_visualization(df, matching_docs)
+
+    display_sankey_dropdown(PERCEIVED_BENEFITS_CATEGORIES, "Perceived Benefits", height=350)
+    
 
 
 # Tab 3 (Health Outcomes)
-with tabs[3]:
-    if matching_docs:
-        # Initialize or get session state for selected health area
-        if 'selected_health_area' not in st.session_state:
-            st.session_state.selected_health_area = "oral"  # Default to oral health
-        
-        # Create keys for storing insights for each health area
-        oral_insights_key = "generated_oral_health_insights"
-        respiratory_insights_key = "generated_respiratory_health_insights"
-        cardiovascular_insights_key = "generated_cardiovascular_health_insights"
+elif active_tab == 3:
+    # Initialize or get session state for selected health area
+    if 'selected_health_area' not in st.session_state:
+        st.session_state.selected_health_area = "oral"  # Default to oral health
+    
+    # Create keys for storing insights for each health area
+    oral_insights_key = TOPIC_KEYS["Oral Health"]
+    respiratory_insights_key = TOPIC_KEYS["Respiratory Health"]
+    cardiovascular_insights_key = TOPIC_KEYS["Cardiovascular Health"]
+    
+    # Create a container for the entire tab with custom CSS for the anatomy diagram only
+    st.markdown(HEALTH_TAB_CSS, unsafe_allow_html=True)
+    
+    # Functions to handle health area selection
+    def select_oral_health():
+        st.session_state.selected_health_area = "oral"
         
-        # Create a container for the entire tab with custom CSS for the anatomy diagram only
-        st.markdown("""
-        <style>
-        /* Make the anatomy diagram larger */
-        .anatomy-diagram {
-            width: 100%;
-            height: 450px;
-        }
-        
-        /* Highlight boxes for different health sections */
-        .highlight-box {
-            border: 2px solid transparent;
-            border-radius: 6px;
-            padding: 4px;
-            margin-bottom: 10px;
-            transition: all 0.3s;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+    def select_respiratory_health():
+        st.session_state.selected_health_area = "lung"
         
-        # Functions to handle health area selection
-        def select_oral_health():
-            st.session_state.selected_health_area = "oral"
-            
-        def select_respiratory_health():
-            st.session_state.selected_health_area = "lung"
-            
-        def select_cardiovascular_health():
-            st.session_state.selected_health_area = "heart"
-        
-        # Create a row with two columns - one for content, one for anatomy
-        col1, col2 = st.columns([1.5, 1])
+    def select_cardiovascular_health():
+        st.session_state.selected_health_area = "heart"
+    
+    # Create a row with two columns - one for content, one for anatomy
+    col1, col2 = st.columns([1.5, 1])
+    
+    # Area for content
+    with col1:
+        # Button row for selecting health area - wrapped in a div with class for CSS targeting
+        st.markdown('<div class="health-tab-buttons">', unsafe_allow_html=True)
+        btn_col1, btn_col2, btn_col3 = st.columns(3)
         
-        # Area for content
-        with col1:
-            # Button row for selecting health area - wrapped in a div with class for CSS targeting
-            st.markdown('<div class="health-tab-buttons">', unsafe_allow_html=True)
-            btn_col1, btn_col2, btn_col3 = st.columns(3)
-            
-            with btn_col1:
-                oral_btn = st.button("Oral Health", 
-                                    on_click=select_oral_health, 
-                                    use_container_width=True,
-                                    key="oral_health_btn")
-                
-            with btn_col2:
-                respiratory_btn = st.button("Respiratory Health", 
-                                          on_click=select_respiratory_health, 
-                                          use_container_width=True,
-                                          key="respiratory_health_btn")
-                
-            with btn_col3:
-                cardiovascular_btn = st.button("Cardiovascular Health", 
-                                             on_click=select_cardiovascular_health, 
-                                             use_container_width=True,
-                                             key="cardiovascular_health_btn")
-            st.markdown('</div>', unsafe_allow_html=True)
+        with btn_col1:
+            oral_btn = st.button("Oral Health", 
+                                on_click=select_oral_health, 
+                                use_container_width=True,
+                                key="oral_health_btn")
             
-            # Use JavaScript to style the active button
-            active_area = st.session_state.selected_health_area
-            if active_area == "oral":
-                st.markdown("""
-                <script>
-                    document.querySelector('.health-tab-buttons [data-testid="stButton"] button[kind="secondary"]').classList.add('active');
-                </script>
-                """, unsafe_allow_html=True)
-            elif active_area == "lung":
-                st.markdown("""
-                <script>
-                    document.querySelectorAll('.health-tab-buttons [data-testid="stButton"] button[kind="secondary"]')[1].classList.add('active');
-                </script>
-                """, unsafe_allow_html=True)
-            elif active_area == "heart":
-                st.markdown("""
-                <script>
-                    document.querySelectorAll('.health-tab-buttons [data-testid="stButton"] button[kind="secondary"]')[2].classList.add('active');
-                </script>
-                """, unsafe_allow_html=True)
+        with btn_col2:
+            respiratory_btn = st.button("Respiratory Health", 
+                                      on_click=select_respiratory_health, 
+                                      use_container_width=True,
+                                      key="respiratory_health_btn")
             
-            # Content based on selected health area
-            if st.session_state.selected_health_area == "oral":
-                oral_health_prompt = """As an R&D specialist analyzing e-cigarette research on oral health, focus exclusively on specific product parameters and ingredients that impact oral health outcomes.
-                    Avoid general statements about oral health impacts and instead extract precise technical information that can directly inform product formulation and design.
-                    
-                    Emphasize:
-                    1. Specific e-liquid ingredients and their measured effects on oral microbiome (with CFU counts or other metrics)
-                    2. Exact pH levels of various e-liquids and their impact on dental erosion (with numerical measurements)
-                    3. Precise temperature ranges associated with reduced oral irritation (with exact values)
-                    4. Particular flavoring compounds linked to improved or worsened oral health outcomes (with measured effects)
-                    5. Specific device design elements that minimize oral tissue exposure to harmful aerosols (with quantified reduction)
-                    6. Comparative data on oral biomarkers between specific product types/generations (with exact values)
-                    
-                    Include specific chemical names, concentrations, and measured biological responses whenever available."""
-
-
-                # Define categories specific to oral health
-                oral_health_categories = {
-                    "Health Outcomes": [
-                        "oral_health.periodontal_health.description",
-                        "oral_health.periodontal_health.measurements",
-                        "oral_health.periodontal_health.significance",
-                        "oral_health.periodontal_health.comparison.effect",
-                        "oral_health.caries_risk.description",
-                        "oral_health.caries_risk.measurements",
-                        "oral_health.oral_mucosal_changes.description",
-                        "oral_health.oral_mucosal_changes.types_of_lesions",
-                        "oral_health.inflammatory_biomarkers.description",
-                        "oral_health.inflammatory_biomarkers.biomarkers_studied",
-                        "oral_health.other_oral_effects.description"
-                    ],
-                    "Self-Reported Effects": [
-                        "adverse_events.oral_events.sore_dry_mouth.overall_percentage",
-                        "adverse_events.oral_events.sore_dry_mouth.time_course",
-                        "adverse_events.oral_events.mouth_tongue_sores.overall_percentage",
-                        "adverse_events.oral_events.gingivitis.overall_percentage",
-                        "adverse_events.oral_events.other_oral_events.event",
-                        "adverse_events.oral_events.other_oral_events.percentage",
-                        "adverse_events.oral_events.cough.overall_percentage"
-                    ],
-                    "Causal Mechanisms": [
-                        "chemicals_implicated.name",
-                        "chemicals_implicated.effects", 
-                        "biological_pathways.pathway",
-                        "biological_pathways.description"
-                    ],
-                    "Key Findings": [
-                        "main_conclusions", 
-                        "novel_findings"
-                    ]
-                }
-                
-                # Display insights for oral health
-                display_insights(
-                    df, 
-                    matching_docs,
-                    section_title="Oral Health Findings",
-                    topic_name="Oral Health",
-                    categories_to_extract=oral_health_categories,
-                    custom_focus_prompt=oral_health_prompt,
-                    tab_index=3,
-                    height=430
-                )
-                
-                
-            elif st.session_state.selected_health_area == "lung":
-                respiratory_prompt = """As an R&D specialist analyzing e-cigarette research on respiratory health, focus exclusively on specific product parameters and ingredients that impact respiratory health outcomes.
-                    Avoid general statements about respiratory health and instead extract precise technical information that can directly improve product safety profiles.
-                    
-                    Emphasize:
-                    1. Specific aerosol particle sizes from different device types and their measured deposition patterns
-                    2. Exact chemical compounds at specific concentrations linked to respiratory irritation
-                    3. Precise temperature/power settings associated with reduced respiratory effects (with numerical values)
-                    4. Particular e-liquid formulations showing improved respiratory safety profiles (with measured data)
-                    5. Specific device design elements that demonstrably filter or reduce harmful respiratory exposures
-                    6. Comparative respiratory biomarker data between specific product designs (with exact measurements)
-                    
-                    Include specific quantitative data on aerosol physics, chemical composition, and physiological responses whenever available."""
-
-
-                # Categories specific to respiratory health
-                respiratory_categories = {
-                    "Health Outcomes": [
-                        "respiratory_effects.measured_outcomes",
-                        "respiratory_effects.findings.description",
-                        "respiratory_effects.findings.comparative_results",
-                        "respiratory_effects.specific_conditions.asthma",
-                        "respiratory_effects.specific_conditions.copd",
-                        "respiratory_effects.specific_conditions.wheezing",
-                        "respiratory_effects.specific_conditions.other_conditions",
-                        "respiratory_effects.biomarkers",
-                        "respiratory_effects.lung_function_tests.tests_performed",
-                        "respiratory_effects.lung_function_tests.results"
-                    ],
-                    "Self-Reported Effects": [
-                        "adverse_events.respiratory_events.breathing_difficulties.overall_percentage",
-                        "adverse_events.respiratory_events.breathing_difficulties.group_percentages",
-                        "adverse_events.respiratory_events.chest_pain.overall_percentage",
-                        "adverse_events.respiratory_events.chest_pain.group_percentages",
-                        "adverse_events.respiratory_events.other_respiratory_events",
-                        "adverse_events.oral_events.cough.overall_percentage",
-                        "adverse_events.oral_events.cough.time_course"
-                    ],
-                    "Causal Mechanisms": [
-                        "chemicals_implicated.name",
-                        "chemicals_implicated.effects",
-                        "biological_pathways.pathway",
-                        "biological_pathways.description"
-                    ],
-                    "Key Findings": [
-                        "main_conclusions", 
-                        "novel_findings"
-                    ]
-                }
-                
-                # Display insights for respiratory health
-                display_insights(
-                    df, 
-                    matching_docs,
-                    section_title="Respiratory Health Findings",
-                    topic_name="Respiratory Health",
-                    categories_to_extract=respiratory_categories,
-                    custom_focus_prompt=respiratory_prompt,
-                    tab_index=3,
-                    height=430
-                )
-                
-                
-            elif st.session_state.selected_health_area == "heart":
-                cardiovascular_prompt = """As an R&D specialist analyzing e-cigarette research on cardiovascular health, focus exclusively on specific product parameters and ingredients that impact cardiovascular health metrics.
-                    Avoid general statements about cardiovascular risks and instead extract precise technical information that can directly inform product design and formulation.
-                    
-                    Emphasize:
-                    1. Specific nicotine delivery patterns and their measured effects on heart rate/blood pressure (with exact values)
-                    2. Exact chemical constituents linked to vascular effects with their concentrations
-                    3. Precise operating parameters associated with minimized cardiovascular impact (with numerical data)
-                    4. Particular device design elements showing improved cardiovascular safety profiles
-                    5. Specific e-liquid formulations with measured reduced impact on endothelial function
-                    6. Comparative cardiac biomarker data between specific product types (with exact measurements)
-                    
-                    Include exact measurements, concentration ranges, and physiological response data whenever available."""
-
-
-                # Categories specific to cardiovascular health
-                cardiovascular_categories = {
-                    "Health Outcomes": [
-                        "cardiovascular_effects.measured_outcomes",
-                        "cardiovascular_effects.findings.description",
-                        "cardiovascular_effects.findings.comparative_results",
-                        "cardiovascular_effects.blood_pressure",
-                        "cardiovascular_effects.heart_rate",
-                        "cardiovascular_effects.biomarkers"
-                    ],
-                    "Self-Reported Effects": [
-                        "adverse_events.cardiovascular_events.heart_palpitation.overall_percentage",
-                        "adverse_events.cardiovascular_events.heart_palpitation.group_percentages",
-                        "adverse_events.cardiovascular_events.other_cardiovascular_events"
-                    ],
-                    "Causal Mechanisms": [
-                        "chemicals_implicated.name",
-                        "chemicals_implicated.effects",
-                        "biological_pathways.pathway",
-                        "biological_pathways.description"
-                    ],
-                    "Key Findings": [
-                        "main_conclusions", 
-                        "novel_findings"
-                    ]
-                }
-                
-                # Display insights for cardiovascular health
-                display_insights(
-                    df, 
-                    matching_docs,
-                    section_title="Cardiovascular Health Findings",
-                    topic_name="Cardiovascular Health",
-                    categories_to_extract=cardiovascular_categories,
-                    custom_focus_prompt=cardiovascular_prompt,
-                    tab_index=3,
-                    height=430
-                )
-                
-        
-        # Anatomy diagram with server-side controlled highlighting
-        with col2:
-            # Fetch SVG content
-            @st.cache_data
-            def get_svg_content():
-                """Fetch SVG content from echarts example"""
-                url = "https://echarts.apache.org/examples/data/asset/geo/Veins_Medical_Diagram_clip_art.svg"
-                response = requests.get(url)
-                if response.status_code == 200:
-                    return response.text
-                else:
-                    st.error(f"Failed to fetch SVG: {response.status_code}")
-                    return None
+        with btn_col3:
+            cardiovascular_btn = st.button("Cardiovascular Health", 
+                                         on_click=select_cardiovascular_health, 
+                                         use_container_width=True,
+                                         key="cardiovascular_health_btn")
+        st.markdown('</div>', unsafe_allow_html=True)
         
-            # Get SVG content
-            svg_content = get_svg_content()
+        # Outline the selected health area's button with a style rule keyed on its widget key
+        active_area = st.session_state.selected_health_area
+        st.markdown(ACTIVE_HEALTH_BUTTON_CSS.format(button_key=HEALTH_AREA_BUTTON_KEYS[active_area]), unsafe_allow_html=True)
         
-            if svg_content:
-                # Create HTML for the anatomy diagram with the current highlighted organ
-                html_template = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <script src="https://cdn.jsdelivr.net/npm/echarts@5.4.3/dist/echarts.min.js"></script>
-                    <style>
-                        html, body {{
-                            margin: 0;
-                            padding: 0;
-                            width: 100%;
-                            height: 100%;
-                            overflow: hidden;
-                        }}
-                        #main {{
-                            width: 100%;
-                            height: 100%;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div id="main"></div>
-                    <script>
-                        // Initialize chart
-                        var chartDom = document.getElementById('main');
-                        var myChart = echarts.init(chartDom);
-                        
-                        // Register the SVG map
-                        echarts.registerMap('organ_diagram', {{
-                            svg: `{svg_content}`
-                        }});
-                        
-                        var option = {{
-                            tooltip: {{
-                                formatter: function(params) {{
-                                    switch(params.name) {{
-                                        case 'lung':
-                                            return 'Lungs - Respiratory System';
-                                        case 'heart':
-                                            return 'Heart - Cardiovascular System';
-                                        case 'oral':
-                                            return 'Oral Cavity - Oral Health';
-                                        default:
-                                            return params.name;
-                                    }}
-                                }}
-                            }},
-                            geo: {{
-                                map: 'organ_diagram',
-                                roam: false,
-                                emphasis: {{
-                                    focus: 'self',
-                                    itemStyle: {{
-                                        color: '#ff3333',  // Highlighting color
-                                        borderWidth: 2,
-                                        borderColor: '#ff0000',
-                                        shadowBlur: 5,
-                                        shadowColor: 'rgba(255, 0, 0, 0.5)'
-                                    }}
-                                }}
-                            }}
-                        }};
-                        
-                        myChart.setOption(option);
-                        
-                        // Set initial highlighting based on server-side state
-                        const highlightedOrgan = "{st.session_state.selected_health_area}";
-                        
-                        if (highlightedOrgan && highlightedOrgan !== "None") {{
-                            // First clear any existing highlights
-                            myChart.dispatchAction({{
-                                type: 'downplay',
-                                geoIndex: 0
-                            }});
-                            
-                            // Then highlight the requested organ
-                            myChart.dispatchAction({{
-                                type: 'highlight',
-                                geoIndex: 0,
-                                name: highlightedOrgan
-                            }});
-                        }}
-                        
-                        // Handle window resize
-                        window.addEventListener('resize', function() {{
-                            myChart.resize();
-                        }});
-                    </script>
-                </body>
-                </html>
-                """
-                        
-                # Add a title for the anatomy visualization
-                st.markdown("<h4 style='text-align: center; margin-top: -50px;'></h4>", unsafe_allow_html=True)
-                
-                # Display the anatomy diagram
-                components_container = st.container()
-                with components_container:
-                    st.components.v1.html(html_template, height=650, scrolling=False)
-                
-            else:
-                st.error("Could not load the anatomy diagram.")
-                    
-        # Display sankey chart after both columns (outside col1 and col2)
+        # Content based on selected health area
         if st.session_state.selected_health_area == "oral":
-            display_sankey_dropdown(oral_health_categories, "Oral Health", height=350, right='15%')
-        elif st.session_state.selected_health_area == "lung":
-            display_sankey_dropdown(respiratory_categories, "Respiratory Health", height=350, right='15%')
-        elif st.session_state.selected_health_area == "heart":
-            display_sankey_dropdown(cardiovascular_categories, "Cardiovascular Health", height=350, right='15%')
-            
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
-        
-
-# Tab 4 (Research Trends)
-with tabs[4]:
-    if matching_docs:
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
+            # Display insights for oral health
+            display_insights(
+                df, 
+                matching_docs,
+                section_title="Oral Health Findings",
+                topic_name="Oral Health",
+                categories_to_extract=ORAL_HEALTH_CATEGORIES,
+                custom_focus_prompt=ORAL_HEALTH_PROMPT,
+                tab_index=3,
+                height=430
+            )
             
-            research_trends_prompt = """As an R&D specialist analyzing e-cigarette research trends, focus exclusively on emerging R&D directions and quantifiable product trends.
-                Avoid general statements about industry evolution and instead extract precise technical information that can inform product development strategy.
-                
-                Emphasize:
-                1. Specific next-generation device technologies with measured performance improvements
-                2. Exact new e-liquid formulations showing enhanced safety/satisfaction profiles (with data)
-                3. Precise shifting consumer preferences with numerical market data
-                4. Particular emerging testing methodologies that provide more accurate product assessment
-                5. Specific regulatory trends that will impact product development (with implementation timelines)
-                6. Quantifiable trends in competing products with exact market share or growth figures
-                
-                Include specific technical innovations, measurable market shifts, and emerging research methodologies whenever available."""
-
-
-
-            # Define categories specific to research trends
-            research_trends_categories = {
-                "Study Characteristics": [
-                    "study_design.primary_type",
-                    "study_design.secondary_features", 
-                    "study_design.time_periods",
-                    "methodology.data_collection_method",
-                    "methodology.e_cigarette_specifications.device_types",
-                    "methodology.e_cigarette_specifications.generation",
-                    "methodology.e_cigarette_specifications.nicotine_content.concentrations",
-                    "methodology.e_cigarette_specifications.e_liquid_types",
-                    "methodology.e_cigarette_specifications.flavors_studied"
-                ],
-                "Key Findings": [
-                    "future_research_suggestions",
-                    "novel_findings"
-                ],
-                "Market Trends": [
-                    "product_characteristics.device_evolution",
-                    "product_characteristics.e_liquid_trends",
-                    "product_characteristics.nicotine_concentration_trends",
-                    "product_characteristics.price_trends",
-                    "regulatory_impacts.regulation_effects",
-                    "regulatory_impacts.policy_recommendations"
-                ],
-                "Behavioral Patterns": [
-                    "usage_patterns.transitions.description",
-                    "usage_patterns.transitions.from_smoking_to_vaping",
-                    "usage_patterns.transitions.from_vaping_to_smoking",
-                    "usage_patterns.transitions.dual_use_patterns",
-                    "product_preferences.device_preferences.most_popular_devices",
-                    "product_preferences.flavor_preferences.most_popular_flavors",
-                    "product_preferences.nicotine_preferences.most_common_concentrations"
-                ]
-            }
             
+        elif st.session_state.selected_health_area == "lung":
+            # Display insights for respiratory health
             display_insights(
                 df, 
                 matching_docs,
-                section_title="Research Trends Analysis",
-                topic_name="Research Trends",
-                categories_to_extract=research_trends_categories,
-                custom_focus_prompt=research_trends_prompt,
-                tab_index=4  # Add tab index
+                section_title="Respiratory Health Findings",
+                topic_name="Respiratory Health",
+                categories_to_extract=RESPIRATORY_HEALTH_CATEGORIES,
+                custom_focus_prompt=RESPIRATORY_HEALTH_PROMPT,
+                tab_index=3,
+                height=430
             )
-                        
-        with col2:
-            render_research_trends_visualization(df, matching_docs)
-            
-        display_sankey_dropdown(research_trends_categories, "Research Trends", height=350)
-
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
-
-
-# Tab 5 (Contradictions & Conflicts)
-with tabs[5]:
-    if matching_docs:
-        col1, col2 = st.columns([1.5, 1])
-        
-        with col1:
             
-            contradictions_prompt = """As an R&D specialist analyzing conflicting e-cigarette research, focus exclusively on specific technical disagreements in the literature that impact product development decisions.
-                Avoid general statements about research limitations and instead extract precise information about conflicting findings relevant to product design.
-                
-                Emphasize:
-                1. Exact contradictory findings about specific ingredients/concentrations and their effects
-                2. Precise conflicting data about optimal operating parameters (temperature, wattage) with specific values
-                3. Particular methodological differences explaining contradictory safety assessments of specific components
-                4. Specific disagreements about aerosol chemistry under different conditions (with measurements)
-                5. Quantitative discrepancies in biomarker responses to particular product characteristics
-                6. Contradictory consumer preference data about specific product features (with numerical values)
-                
-                Include specific numerical data points from conflicting studies and identify potential reasons for discrepancies."""
-                
-
-
-            # Define categories specific to contradictions and conflicts
-            contradictions_categories = {
-                "Key Findings": [
-                    "contradictions.conflicts_with_literature",
-                    "contradictions.internal_contradictions",
-                    "generalizability",
-                    "limitations"
-                ],
-                "Bias Assessment": [
-                    "conflicts_of_interest.description",
-                    "conflicts_of_interest.industry_affiliations",
-                    "conflicts_of_interest.transparency",
-                    "methodological_concerns",
-                    "overall_quality_assessment"
-                ],
-                "Causal Mechanisms": [
-                    "chemicals_implicated.name",
-                    "chemicals_implicated.evidence_strength",
-                    "biological_pathways.pathway",
-                    "biological_pathways.evidence_strength"
-                ],
-                "R&D Insights": [
-                    "comparative_benefits.vs_traditional_cigarettes.benefit",
-                    "comparative_benefits.vs_traditional_cigarettes.evidence_strength",
-                    "harmful_ingredients.name",
-                    "harmful_ingredients.health_impact",
-                    "harmful_ingredients.comparison_to_cigarettes",
-                    "harmful_ingredients.evidence_strength"
-                ]
-            }
             
+        elif st.session_state.selected_health_area == "heart":
+            # Display insights for cardiovascular health
             display_insights(
                 df, 
                 matching_docs,
-                section_title="Contradictions & Conflicts Analysis",
-                topic_name="Contradictions and Conflicts",
-                categories_to_extract=contradictions_categories,
-                custom_focus_prompt=contradictions_prompt,
-                tab_index=5  # Add tab index
+                section_title="Cardiovascular Health Findings",
+                topic_name="Cardiovascular Health",
+                categories_to_extract=CARDIOVASCULAR_HEALTH_CATEGORIES,
+                custom_focus_prompt=CARDIOVASCULAR_HEALTH_PROMPT,
+                tab_index=3,
+                height=430
             )
-                        
-        # with col2:
-            # render_contradictions_visualization(df, matching_docs)
+            
+    
+    # Anatomy diagram with server-side controlled highlighting
+    with col2:
+        # Get the anatomy diagram page
+        anatomy_diagram_html = get_anatomy_diagram_html()
+    
+        if anatomy_diagram_html:
+            # Add a title for the anatomy visualization
+            st.markdown("<h4 style='text-align: center; margin-top: -50px;'></h4>", unsafe_allow_html=True)
+            
+            # Display the anatomy diagram
+            components_container = st.container()
+            with components_container:
+                st.components.v1.html(anatomy_diagram_html, height=650, scrolling=False)
+                st.components.v1.html(ANATOMY_HIGHLIGHT_SCRIPT.format(organ=st.session_state.selected_health_area), height=0)
+            
+        else:
+            st.error("Could not load the anatomy diagram.")
+                
+    # Display sankey chart after both columns (outside col1 and col2)
+    if st.session_state.selected_health_area == "oral":
+        display_sankey_dropdown(ORAL_HEALTH_CATEGORIES, "Oral Health", height=350, right='15%')
+    elif st.session_state.selected_health_area == "lung":
+        display_sankey_dropdown(RESPIRATORY_HEALTH_CATEGORIES, "Respiratory Health", height=350, right='15%')
+    elif st.session_state.selected_health_area == "heart":
+        display_sankey_dropdown(CARDIOVASCULAR_HEALTH_CATEGORIES, "Cardiovascular Health", height=350, right='15%')
+        
         
-        display_sankey_dropdown(contradictions_categories, "Contradictions & Conflicts", height=350)
 
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
+# Tab 4 (Research Trends)
+elif active_tab == 4:
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        
+        display_insights(
+            df, 
+            matching_docs,
+            section_title="Research Trends Analysis",
+            topic_name="Research Trends",
+            categories_to_extract=RESEARCH_TRENDS_CATEGORIES,
+            custom_focus_prompt=RESEARCH_TRENDS_PROMPT,
+            tab_index=4  # Add tab index
+        )
+                    
+    with col2:
+        render_research_trends_visualization(df, matching_docs)
+        
+    display_sankey_dropdown(RESEARCH_TRENDS_CATEGORIES, "Research Trends", height=350)
 
 
-# Tab 6 (Bias in Research)
-with tabs[6]:
-    if matching_docs:
-        col1, col2 = st.columns([1, 1])
+
+# Tab 5 (Contradictions & Conflicts)
+elif active_tab == 5:
+    col1, col2 = st.columns([1.5, 1])
+    
+    with col1:
         
-        with col1:
-            
-            bias_prompt = """As an R&D specialist analyzing methodological issues in e-cigarette research, focus exclusively on methodological issues that could distort understanding of specific product characteristics.
-                Avoid general comments about research quality and instead extract precise information about testing and measurement methods relevant to product development.
-                
-                Emphasize:
-                1. Specific product testing protocols that produce particularly reliable/unreliable data
-                2. Exact measurement techniques for aerosol constituents with identified limitations/advantages
-                3. Particular study designs that provide the most actionable product development insights
-                4. Specific control variables that significantly impact assessment of product safety/satisfaction
-                5. Methodological best practices for evaluating specific aspects of e-cigarette performance
-                6. Measurement biases affecting evaluation of particular device features or e-liquid components
-                
-                Include specific analytical methods, instrument specifications, and experimental design considerations whenever available."""
-                
+        display_insights(
+            df, 
+            matching_docs,
+            section_title="Contradictions & Conflicts Analysis",
+            topic_name="Contradictions and Conflicts",
+            categories_to_extract=CONTRADICTIONS_CATEGORIES,
+            custom_focus_prompt=CONTRADICTIONS_PROMPT,
+            tab_index=5  # Add tab index
+        )
+                    
+    # with col2:
+        # render_contradictions_visualization(df, matching_docs)
+    
+    display_sankey_dropdown(CONTRADICTIONS_CATEGORIES, "Contradictions & Conflicts", height=350)
 
 
-            # Define categories specific to bias in research
-            bias_categories = {
-                "Bias Assessment": [
-                    "selection_bias",
-                    "measurement_bias",
-                    "confounding_factors",
-                    "attrition_bias",
-                    "reporting_bias",
-                    "conflicts_of_interest.description",
-                    "conflicts_of_interest.industry_affiliations",
-                    "conflicts_of_interest.transparency",
-                    "methodological_concerns",
-                    "overall_quality_assessment"
-                ],
-                "Meta Data": [
-                    "funding_source.type",
-                    "funding_source.specific_entities",
-                    "funding_source.disclosure_statement"
-                ],
-                "Key Findings": [
-                    "limitations",
-                    "generalizability"
-                ],
-                "Study Characteristics": [
-                    "statistical_methods.adjustment_factors",
-                    "methodology.control_variables",
-                    "methodology.inclusion_criteria",
-                    "methodology.exclusion_criteria"
-                ]
-            }
-            
-            display_insights(
-                df, 
-                matching_docs,
-                section_title="Bias in Research Analysis",
-                topic_name="Research Bias",
-                categories_to_extract=bias_categories,
-                custom_focus_prompt=bias_prompt,
-                tab_index=6  # Add tab index
-            )
-                        
-        with col2:
-            render_bias_visualization(df, matching_docs)
+
+# Tab 6 (Bias in Research)
+elif active_tab == 6:
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
         
-        display_sankey_dropdown(bias_categories, "Bias in Research", height=350)
+        display_insights(
+            df, 
+            matching_docs,
+            section_title="Bias in Research Analysis",
+            topic_name="Research Bias",
+            categories_to_extract=RESEARCH_BIAS_CATEGORIES,
+            custom_focus_prompt=RESEARCH_BIAS_PROMPT,
+            tab_index=6  # Add tab index
+        )
+                    
+    with col2:
+        render_bias_visualization(df, matching_docs)
     
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
+    display_sankey_dropdown(RESEARCH_BIAS_CATEGORIES, "Bias in Research", height=350)
+
 
 
 # Tab 7 (Publication Level)
-with tabs[7]:
-    if matching_docs:
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            
-            publication_prompt = """As an R&D specialist analyzing e-cigarette research quality, focus exclusively on identifying the most credible and technically rigorous product research.
-                Avoid general assessment of publication patterns and instead extract precise information about the most reliable sources of technical product data.
-                
-                Emphasize:
-                1. Specific publications/research groups producing the most methodologically sound product assessments
-                2. Exact analytical methods that provide most reliable data on product characteristics
-                3. Particular study designs yielding most actionable product improvement insights
-                4. Specific technical expertise patterns across research institutions
-                5. Most rigorous comparative studies between product types with detailed methodologies
-                6. Cutting-edge analytical techniques being applied to product assessment
-                
-                Include specific research institutions, analytical methodologies, and citation metrics for the most technically reliable research."""
-
-
-            # Define categories specific to publication level
-            publication_categories = {
-                "Meta Data": [
-                    "publication_type",
-                    "journal",
-                    "citation_info",
-                    "publication_year",
-                    "country_of_study",
-                    "authors",
-                    "funding_source.type",
-                    "funding_source.specific_entities"
-                ],
-                "Study Characteristics": [
-                    "sample_characteristics.total_size",
-                    "study_design.primary_type",
-                    "study_design.secondary_features",
-                    "statistical_methods.primary_analyses",
-                    "statistical_methods.secondary_analyses"
-                ],
-                "Key Findings": [
-                    "statistical_summary.primary_outcomes",
-                    "statistical_summary.secondary_outcomes",
-                    "main_conclusions",
-                    "novel_findings"
-                ],
-                "Bias Assessment": [
-                    "overall_quality_assessment",
-                    "conflicts_of_interest.description",
-                    "conflicts_of_interest.industry_affiliations"
-                ]
-            }
-            
-            display_insights(
-                df, 
-                matching_docs,
-                section_title="Publication Level Analysis",
-                topic_name="Publication Metrics",
-                categories_to_extract=publication_categories,
-                custom_focus_prompt=publication_prompt,
-                tab_index=7,  # Add tab index
-                height=460
-            )
-            
-        with col2:
-            render_publication_level_visualization(df, matching_docs)
+elif active_tab == 7:
+    col1, col2 = st.columns([1, 1])
     
-        display_sankey_dropdown(publication_categories, "Publication Level", height=350)
+    with col1:
+        
+        display_insights(
+            df, 
+            matching_docs,
+            section_title="Publication Level Analysis",
+            topic_name="Publication Metrics",
+            categories_to_extract=PUBLICATION_LEVEL_CATEGORIES,
+            custom_focus_prompt=PUBLICATION_LEVEL_PROMPT,
+            tab_index=7,  # Add tab index
+            height=460
+        )
+        
+    with col2:
+        render_publication_level_visualization(df, matching_docs)
+
+    display_sankey_dropdown(PUBLICATION_LEVEL_CATEGORIES, "Publication Level", height=350)
 
-    else:
-        st.warning("No documents match the selected filters. Please adjust your filter criteria.")
         
 
 st.write("")
@@ -1763,12 +1299,14 @@ if st.checkbox("Show E-Cigarette Research Data Structure"):
 
 # Show document details for debugging
 if st.checkbox("Show Document Details"):
-    from data_display_utils import display_document_details
     display_document_details(df, matching_docs)
 
 # Show raw data if needed
 if st.checkbox("Show Sample Document Data"):
-    from data_display_utils import display_raw_data
     display_raw_data(df)
     
     
+
+# Submit the insights of every tab once the selected tab has queued its requests
+if st.session_state.insights_in_progress and st.session_state.get("insights_batch_mode", False):
+    process_insights_batch(df, matching_docs)
@@ -33,9 +33,10 @@ def get_publications_by_year(df, matching_docs):
     
     if 'publication_year' in df['Category'].values:
         year_rows = df[df['Category'] == 'publication_year']
+        year_values = year_rows.iloc[0].to_dict() if not year_rows.empty else {}
         
         for doc_col in matching_docs:
-            year_value = year_rows[doc_col].iloc[0] if not year_rows.empty else None
+            year_value = year_values.get(doc_col)
             if year_value and not pd.isna(year_value):
                 try:
                     year = int(float(year_value))
@@ -74,8 +75,11 @@ def generate_pyecharts_sunburst_data(df, matching_docs):
     
     # Get rows for each category
     pub_type_rows = df[df['Category'] == 'publication_type']
+    pub_type_values = pub_type_rows.iloc[0].to_dict() if not pub_type_rows.empty else {}
     study_design_rows = df[df['SubCategory'] == 'primary_type']
+    study_design_values = study_design_rows.iloc[0].to_dict() if not study_design_rows.empty else {}
     funding_rows = df[df['SubCategory'] == 'type']
+    funding_values = funding_rows.iloc[0].to_dict() if not funding_rows.empty else {}
     
     # Track document relationships between categories
     relationships = {}
@@ -85,14 +89,14 @@ def generate_pyecharts_sunburst_data(df, matching_docs):
         # Extract publication type
         if not pub_type_rows.empty:
             try:
-                pub_type = pub_type_rows[doc_col].iloc[0]
+                pub_type = pub_type_values[doc_col]
                 if pub_type and not pd.isna(pub_type):
                     pub_types[pub_type] = pub_types.get(pub_type, 0) + 1
                     
                     # Extract study design for this document
                     if not study_design_rows.empty:
                         try:
-                            design = study_design_rows[doc_col].iloc[0]
+                            design = study_design_values[doc_col]
                             if design and not pd.isna(design):
                                 study_designs[design] = study_designs.get(design, 0) + 1
                                 
@@ -105,7 +109,7 @@ def generate_pyecharts_sunburst_data(df, matching_docs):
                                 # Extract funding source for this document
                                 if not funding_rows.empty:
                                     try:
-                                        funding = funding_rows[doc_col].iloc[0]
+                                        funding = funding_values[doc_col]
                                         if funding and not pd.isna(funding):
                                             funding_sources[funding] = funding_sources.get(funding, 0) + 1
                                             
@@ -305,9 +309,10 @@ def get_countries_by_study(df, matching_docs):
     # Find rows where Category is 'country_of_study'
     if 'Category' in df.columns and 'country_of_study' in df['Category'].values:
         country_rows = df[df['Category'] == 'country_of_study']
+        country_values = country_rows.iloc[0].to_dict() if not country_rows.empty else {}
         
         for doc_col in matching_docs:
-            country_value = country_rows[doc_col].iloc[0] if not country_rows.empty else None
+            country_value = country_values.get(doc_col)
             
             if country_value and not pd.isna(country_value):
                 # Split by comma, semicolon, or 'and' to handle multiple countries in one cell
@@ -440,11 +445,13 @@ def display_publication_type_chart(df, matching_docs, pub_df):
     
     if 'publication_type' in df['Category'].values:
         year_rows = df[df['Category'] == 'publication_year']
+        year_values = year_rows.iloc[0].to_dict() if not year_rows.empty else {}
         type_rows = df[df['Category'] == 'publication_type']
+        type_values = type_rows.iloc[0].to_dict() if not type_rows.empty else {}
         
         for doc_col in matching_docs:
-            year_value = year_rows[doc_col].iloc[0] if not year_rows.empty else None
-            pub_type = type_rows[doc_col].iloc[0] if not type_rows.empty else None
+            year_value = year_values.get(doc_col)
+            pub_type = type_values.get(doc_col)
             
             if year_value and pub_type and not pd.isna(year_value) and not pd.isna(pub_type):
                 try:
@@ -587,11 +594,13 @@ def display_funding_chart(df, matching_docs):
     
     if 'type' in df['SubCategory'].values:
         year_rows = df[df['Category'] == 'publication_year']
+        year_values = year_rows.iloc[0].to_dict() if not year_rows.empty else {}
         funding_rows = df[df['SubCategory'] == 'type']
+        funding_values = funding_rows.iloc[0].to_dict() if not funding_rows.empty else {}
         
         for doc_col in matching_docs:
-            year_value = year_rows[doc_col].iloc[0] if not year_rows.empty else None
-            funding = funding_rows[doc_col].iloc[0] if not funding_rows.empty else None
+            year_value = year_values.get(doc_col)
+            funding = funding_values.get(doc_col)
             
             if year_value and funding and not pd.isna(year_value) and not pd.isna(funding):
                 try:
@@ -732,11 +741,13 @@ def display_study_design_chart(df, matching_docs):
     
     if 'primary_type' in df['SubCategory'].values:
         year_rows = df[df['Category'] == 'publication_year']
+        year_values = year_rows.iloc[0].to_dict() if not year_rows.empty else {}
         design_rows = df[df['SubCategory'] == 'primary_type']
+        design_values = design_rows.iloc[0].to_dict() if not design_rows.empty else {}
         
         for doc_col in matching_docs:
-            year_value = year_rows[doc_col].iloc[0] if not year_rows.empty else None
-            design = design_rows[doc_col].iloc[0] if not design_rows.empty else None
+            year_value = year_values.get(doc_col)
+            design = design_values.get(doc_col)
             
             if year_value and design and not pd.isna(year_value) and not pd.isna(design):
                 try:
@@ -914,16 +925,19 @@ def display_yearly_chart(pub_df):
     pub_df (pandas.DataFrame): DataFrame with Year and Count columns
     """
     # Original yearly bar chart
-    fig = px.bar(
-        pub_df,
-        x='Year',
-        y='Count',
+    fig = go.Figure(go.Bar(
+        x=pub_df['Year'],
+        y=pub_df['Count'],
+        marker_color='#f07300',
+        hovertemplate='Year=%{x}<br>Number of Publications=%{y}<extra></extra>'
+    ))
+    
+    fig.update_layout(
         title="Publications by Year",
-        labels={'Count': 'Number of Publications', 'Year': 'Year'},
-        color_discrete_sequence=['#f07300']
+        xaxis_title="Year",
+        yaxis_title="Number of Publications",
+        height=500
     )
-    
-    fig.update_layout(height=500)
     st.plotly_chart(fig, use_container_width=True)
 
 def display_publication_distribution(df, matching_docs):
@@ -1033,7 +1047,9 @@ def extract_ingredients_data(df, matching_docs):
     """
     # Find relevant rows
     ingredients_name_row = df[df['Category'] == 'harmful_ingredients'].loc[df['SubCategory'] == 'name']
+    ingredients_name_values = ingredients_name_row.iloc[0].to_dict() if not ingredients_name_row.empty else {}
     evidence_strength_row = df[df['Category'] == 'harmful_ingredients'].loc[df['SubCategory'] == 'evidence_strength']
+    evidence_strength_values = evidence_strength_row.iloc[0].to_dict() if not evidence_strength_row.empty else {}
     
     if ingredients_name_row.empty:
         return []
@@ -1057,8 +1073,8 @@ def extract_ingredients_data(df, matching_docs):
         if paper not in ingredients_name_row.columns:
             continue
             
-        ingredients_text = ingredients_name_row[paper].iloc[0] if not ingredients_name_row.empty else None
-        strengths_text = evidence_strength_row[paper].iloc[0] if not evidence_strength_row.empty else None
+        ingredients_text = ingredients_name_values.get(paper)
+        strengths_text = evidence_strength_values.get(paper)
         
         if ingredients_text and pd.notna(ingredients_text):
             ingredients = parse_numbered_list(ingredients_text)
@@ -1190,7 +1206,9 @@ def get_health_impacts(df, matching_docs, ingredient_name):
     """
     # Find health impact row
     health_impact_row = df[df['Category'] == 'harmful_ingredients'].loc[df['SubCategory'] == 'health_impact']
+    health_impact_values = health_impact_row.iloc[0].to_dict() if not health_impact_row.empty else {}
     ingredients_name_row = df[df['Category'] == 'harmful_ingredients'].loc[df['SubCategory'] == 'name']
+    ingredients_name_values = ingredients_name_row.iloc[0].to_dict() if not ingredients_name_row.empty else {}
     
     if health_impact_row.empty or ingredients_name_row.empty:
         return []
@@ -1210,8 +1228,8 @@ def get_health_impacts(df, matching_docs, ingredient_name):
         if paper not in ingredients_name_row.columns:
             continue
             
-        ingredients_text = ingredients_name_row[paper].iloc[0] if not ingredients_name_row.empty else None
-        impacts_text = health_impact_row[paper].iloc[0] if not health_impact_row.empty else None
+        ingredients_text = ingredients_name_values.get(paper)
+        impacts_text = health_impact_values.get(paper)
         
         if ingredients_text and pd.notna(ingredients_text) and impacts_text and pd.notna(impacts_text):
             ingredients = parse_numbered_list(ingredients_text)
@@ -1260,10 +1278,11 @@ def render_perceived_benefits_visualization(df, matching_docs):
         # Find rows with this benefit's overall percentage
         rows = df[(df['Category'] == 'perceived_health_improvements') & 
                   (df['SubCategory'] == f"{benefit}.overall_percentage")]
+        row_values = rows.iloc[0].to_dict() if not rows.empty else {}
         
         values = []
         for doc_col in matching_docs:
-            value = rows[doc_col].iloc[0] if not rows.empty else None
+            value = row_values.get(doc_col)
             if value and not pd.isna(value):
                 try:
                     values.append(float(value))
@@ -1311,24 +1330,25 @@ def render_perceived_benefits_visualization(df, matching_docs):
     # Extract smoking cessation success rates
     cessation_rows = df[(df['Category'] == 'smoking_cessation') & 
                         (df['SubCategory'] == 'success_rates')]
+    cessation_values = cessation_rows.iloc[0].to_dict() if not cessation_rows.empty else {}
     
     cessation_data = {}
     for doc_col in matching_docs:
-        value = cessation_rows[doc_col].iloc[0] if not cessation_rows.empty else None
+        value = cessation_values.get(doc_col)
         if value and not pd.isna(value):
             cessation_data[doc_col] = value
     
     if cessation_data:
         # Create a bar chart for cessation success rates
-        fig = px.bar(
+        fig = go.Figure(go.Bar(
             x=list(cessation_data.keys()),
             y=list(cessation_data.values()),
-            labels={'x': 'Study', 'y': 'Success Rate (%)'},
-            title="Smoking Cessation Success Rates Across Studies",
-            color_discrete_sequence=['#5aac90']
-        )
+            marker_color='#5aac90',
+            hovertemplate='Study=%{x}<br>Success Rate (%)=%{y}<extra></extra>'
+        ))
         
         fig.update_layout(
+            title="Smoking Cessation Success Rates Across Studies",
             xaxis_title="Study",
             yaxis_title="Success Rate (%)",
             height=400
@@ -1346,17 +1366,19 @@ def render_research_trends_visualization(df, matching_docs):
     
     # Get primary study types
     study_type_rows = df[df['SubCategory'] == 'primary_type']
+    study_type_values = study_type_rows.iloc[0].to_dict() if not study_type_rows.empty else {}
     
     # Get publication years for matching documents
     year_rows = df[df['Category'] == 'publication_year']
+    year_values = year_rows.iloc[0].to_dict() if not year_rows.empty else {}
     
     # Create a dictionary to store study types by year
     study_types_by_year = {}
     
     for doc_col in matching_docs:
         # Get year for this document
-        year_value = year_rows[doc_col].iloc[0] if not year_rows.empty else None
-        study_type = study_type_rows[doc_col].iloc[0] if not study_type_rows.empty else None
+        year_value = year_values.get(doc_col)
+        study_type = study_type_values.get(doc_col)
         
         if year_value and study_type and not pd.isna(year_value) and not pd.isna(study_type):
             try:
@@ -1418,13 +1440,14 @@ def render_contradictions_visualization(df, matching_docs):
     # Extract data about contradictions
     contradictions_rows = df[(df['Category'] == 'contradictions') & 
                             (df['SubCategory'] == 'conflicts_with_literature')]
+    contradictions_values = contradictions_rows.iloc[0].to_dict() if not contradictions_rows.empty else {}
     
     # Count documents with contradictions
     contradictions_count = 0
     no_contradictions_count = 0
     
     for doc_col in matching_docs:
-        contradiction_value = contradictions_rows[doc_col].iloc[0] if not contradictions_rows.empty else None
+        contradiction_value = contradictions_values.get(doc_col)
         
         if contradiction_value and not pd.isna(contradiction_value):
             # Check if there's any indication of contradictions
@@ -1473,10 +1496,11 @@ def render_contradictions_visualization(df, matching_docs):
         else:
             rows = df[(df['Category'] == category) & 
                       (df['SubCategory'] == subcategory)]
+        row_values = rows.iloc[0].to_dict() if not rows.empty else {}
         
         values = []
         for doc_col in matching_docs:
-            value = rows[doc_col].iloc[0] if not rows.empty else None
+            value = row_values.get(doc_col)
             if value and not pd.isna(value):
                 values.append(str(value))
         
@@ -1547,10 +1571,11 @@ def render_bias_visualization(df, matching_docs):
     
     # Extract funding source information
     funding_rows = df[df['SubCategory'] == 'type']
+    funding_values = funding_rows.iloc[0].to_dict() if not funding_rows.empty else {}
     
     funding_types = {}
     for doc_col in matching_docs:
-        funding_type = funding_rows[doc_col].iloc[0] if not funding_rows.empty else None
+        funding_type = funding_values.get(doc_col)
         if funding_type and not pd.isna(funding_type):
             if funding_type not in funding_types:
                 funding_types[funding_type] = 0
@@ -1567,10 +1592,11 @@ def render_bias_visualization(df, matching_docs):
     for bias_type in bias_categories:
         # Find rows with this bias type
         rows = df[df['Category'] == bias_type]
+        row_values = rows.iloc[0].to_dict() if not rows.empty else {}
         
         values = []
         for doc_col in matching_docs:
-            value = rows[doc_col].iloc[0] if not rows.empty else None
+            value = row_values.get(doc_col)
             if value and not pd.isna(value):
                 values.append(str(value))
         
@@ -1598,13 +1624,14 @@ def render_bias_visualization(df, matching_docs):
     
     # Extract main conclusions for sentiment analysis
     conclusions_rows = df[df['Category'] == 'main_conclusions']
+    conclusions_values = conclusions_rows.iloc[0].to_dict() if not conclusions_rows.empty else {}
     
     # Analyze sentiment of conclusions by funding source
     conclusion_sentiment = {}
     
     for doc_col in matching_docs:
-        funding_type = funding_rows[doc_col].iloc[0] if not funding_rows.empty else None
-        conclusion = conclusions_rows[doc_col].iloc[0] if not conclusions_rows.empty else None
+        funding_type = funding_values.get(doc_col)
+        conclusion = conclusions_values.get(doc_col)
         
         if funding_type and conclusion and not pd.isna(funding_type) and not pd.isna(conclusion):
             # Simple sentiment analysis
@@ -1628,15 +1655,15 @@ def render_bias_visualization(df, matching_docs):
     if viz_option == "Funding Sources":
         if funding_types:
             # Create pie chart for funding sources with pastel colors
-            fig = px.pie(
+            fig = go.Figure(go.Pie(
                 values=list(funding_types.values()),
-                names=list(funding_types.keys()),
-                title="Funding Sources Distribution",
-                color_discrete_sequence=px.colors.qualitative.Pastel1  # Changed to pastel colors
-            )
+                labels=list(funding_types.keys()),
+                hovertemplate='label=%{label}<br>value=%{value}<extra></extra>'
+            ))
             
-            # Apply margin settings in update_layout instead of directly in px.pie
             fig.update_layout(
+                title="Funding Sources Distribution",
+                piecolorway=px.colors.qualitative.Pastel1,  # Changed to pastel colors
                 height=430,
                 margin=dict(t=40, b=0, l=0, r=0)  # Reduce top margin to remove space
             )
@@ -1728,10 +1755,11 @@ def render_publication_level_visualization(df, matching_docs):
     elif visualization_type == "Publication Types":
         # Extract publication types
         publication_type_rows = df[df['Category'] == 'publication_type']
+        publication_type_values = publication_type_rows.iloc[0].to_dict() if not publication_type_rows.empty else {}
         
         publication_types = {}
         for doc_col in matching_docs:
-            pub_type = publication_type_rows[doc_col].iloc[0] if not publication_type_rows.empty else None
+            pub_type = publication_type_values.get(doc_col)
             if pub_type and not pd.isna(pub_type):
                 if pub_type not in publication_types:
                     publication_types[pub_type] = 0
@@ -1739,14 +1767,15 @@ def render_publication_level_visualization(df, matching_docs):
         
         if publication_types:
             # Create a pie chart for publication types with pastel colors
-            fig = px.pie(
-                names=list(publication_types.keys()),
+            fig = go.Figure(go.Pie(
+                labels=list(publication_types.keys()),
                 values=list(publication_types.values()),
-                title="Distribution of Publication Types",
-                color_discrete_sequence=px.colors.qualitative.Pastel1,
-            )
+                hovertemplate='label=%{label}<br>value=%{value}<extra></extra>'
+            ))
             
             fig.update_layout(
+                title="Distribution of Publication Types",
+                piecolorway=px.colors.qualitative.Pastel1,
                 height=380,
                 margin=dict(t=40, b=0, l=0, r=0)  # Reduce top margin to remove space
             )
@@ -2053,9 +2082,6 @@ def display_main_category_sankey(categories_df, selected_main_category, height=5
         bg_color: Background color for the chart area
         right: CSS position for the right margin
     """
-    import json
-    import random
-    
     # Filter the dataframe for the selected main category
     filtered_df = categories_df[categories_df["Main Category"] == selected_main_category]
     